@@ -23,14 +23,14 @@ class ProjectAdmin(ModelView, model=ProjectTableModel):
     name_plural = "Проекты"
 
 class TaskAdmin(ModelView, model=TaskTableModel):
-    column_list = [c.name for c in TaskTableModel.__table__.c]
+    column_list = [c.name for c in TaskTableModel.__table__.c if c.name != "search_vector"]
     form_columns = ["name", "description", "project_id", "creator_id", "assignee_id", "priority", "status"]
     name = "Задачи"
     name_plural = "Задачи"
     can_create = False
 
 class CommentAdmin(ModelView, model=CommentTableModel):
-    column_list = [c.name for c in CommentTableModel.__table__.c]
+    column_list = [c.name for c in CommentTableModel.__table__.c if c.name != "search_vector"]
     form_columns = ["creator_id", "comment_text", "task_id", "is_deleted"]
     name = "Комментарий"
     name_plural = "Комментарии"
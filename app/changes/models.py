@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, BigInteger, Integer, ForeignKey, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class ChangeLogTableModel(Base):
+    """Журнал изменений задач и комментариев: строки только добавляются, в той же транзакции, что и изменение."""
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_project_id_txid_id", "project_id", "txid", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, comment="Порядковый номер записи")
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, comment="ID проекта"
+    )
+    entity: Mapped[str] = mapped_column(String(20), nullable=False, comment="Тип сущности: task или comment")
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False, comment="ID изменённой сущности")
+    action: Mapped[str] = mapped_column(String(10), nullable=False, comment="created, updated или deleted")
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("txid_current()"),
+        comment="ID транзакции, записавшей изменение",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        comment="Дата и время изменения"
+    )
+
+    def __str__(self):
+        return f"Change {self.id}: {self.entity} {self.entity_id} {self.action}"
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.changes.schemas import SchemaChanges
+from app.changes.service import ChangeLogService
+from app.database import get_async_session
+from app.users.dependencies import get_current_user
+from app.users.schemas import SchemaPrincipal
+
+router = APIRouter(prefix="/project", tags=["Changes"], dependencies=[Depends(get_async_session)])
+
+
+@router.get("/{project_id}/changes", response_model=SchemaChanges)
+async def get_project_changes(
+        project_id: int,
+        since: str | None = Query(None, description="next_cursor предыдущего ответа; без него — вся история"),
+        limit: int = Query(1000, ge=1, le=5000, description="Сколько записей журнала обработать за запрос"),
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await ChangeLogService.get_changes(project_id, since, limit, current_user)
@@ -0,0 +1,20 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.comments.schemas import SchemaComment
+from app.tasks.schemas import SchemaTask
+
+
+class SchemaTombstone(BaseModel):
+    """Удалённая сущность"""
+    entity: Literal["task", "comment"] = Field(..., description="Тип сущности")
+    id: int = Field(..., description="ID удалённой сущности")
+
+class SchemaChanges(BaseModel):
+    """Изменения проекта после курсора since"""
+    tasks: list[SchemaTask] = Field(..., description="Созданные или изменённые задачи в текущем состоянии")
+    comments: list[SchemaComment] = Field(..., description="Созданные или изменённые комментарии в текущем состоянии")
+    deleted: list[SchemaTombstone] = Field(..., description="Удалённые задачи и комментарии")
+    next_cursor: str | None = Field(None, description="Курсор для следующего запроса since")
+    has_more: bool = Field(False, description="Есть ли ещё изменения после next_cursor")
@@ -0,0 +1,102 @@
+from typing import Any, Optional
+
+from sqlalchemy import select, insert, tuple_, func
+
+from app.changes.models import ChangeLogTableModel
+from app.changes.schemas import SchemaChanges, SchemaTombstone
+from app.comments.models import CommentTableModel
+from app.database import session_scope
+from app.service.base import BaseService
+from app.service.pagination import encode_cursor, decode_cursor
+from app.tasks.dependencies import check_access_for_tasks
+from app.tasks.models import TaskTableModel
+from app.users.schemas import SchemaPrincipal
+
+
+class ChangeLogService(BaseService):
+    model = ChangeLogTableModel
+
+    @classmethod
+    async def record(cls, session, project_id: Any, entity: str, action: str, entity_id: int) -> None:
+        """Записать изменение в транзакции session; project_id может быть SQL-выражением."""
+        await session.execute(
+            insert(ChangeLogTableModel).values(
+                project_id=project_id, entity=entity, action=action, entity_id=entity_id
+            )
+        )
+
+    @classmethod
+    async def record_many(cls, session, project_id: int, entity: str, action: str, entity_ids: list[int]) -> None:
+        if entity_ids:
+            await session.execute(
+                insert(ChangeLogTableModel),
+                [
+                    {"project_id": project_id, "entity": entity, "action": action, "entity_id": entity_id}
+                    for entity_id in entity_ids
+                ],
+            )
+
+    @classmethod
+    async def get_changes(
+            cls,
+            project_id: int,
+            since: Optional[str],
+            limit: int,
+            current_user: SchemaPrincipal
+    ) -> SchemaChanges:
+        """
+        Изменения проекта после курсора since, схлопнутые до последнего действия по каждой сущности.
+        Записи упорядочены по (txid, id) и отдаются только для транзакций старше самой старой незавершённой:
+        иначе транзакция, зафиксированная позже, могла бы оказаться позади уже выданного курсора.
+        Комментарии, удалённые каскадом вместе с задачей, отдельных записей не получают.
+        """
+        await check_access_for_tasks(project_id, current_user)
+        query = select(ChangeLogTableModel).where(
+            ChangeLogTableModel.project_id == project_id,
+            ChangeLogTableModel.txid < func.txid_snapshot_xmin(func.txid_current_snapshot()),
+        )
+        if since:
+            last_txid, last_id = decode_cursor(since, int, int)
+            query = query.where(
+                tuple_(ChangeLogTableModel.txid, ChangeLogTableModel.id) > tuple_(last_txid, last_id)
+            )
+        query = query.order_by(ChangeLogTableModel.txid, ChangeLogTableModel.id).limit(limit + 1)
+
+        async with session_scope() as session:
+            result = await session.execute(query)
+            changes = result.scalars().all()
+            has_more = len(changes) > limit
+            changes = changes[:limit]
+
+            last_actions = {}
+            for change in changes:
+                last_actions[(change.entity, change.entity_id)] = change.action
+            alive = {"task": [], "comment": []}
+            for (entity, entity_id), action in last_actions.items():
+                if action != "deleted":
+                    alive[entity].append(entity_id)
+
+            tasks, comments = [], []
+            if alive["task"]:
+                result = await session.execute(
+                    select(TaskTableModel).where(
+                        TaskTableModel.id.in_(alive["task"]), TaskTableModel.project_id == project_id
+                    )
+                )
+                tasks = result.scalars().all()
+            if alive["comment"]:
+                result = await session.execute(
+                    select(CommentTableModel).where(CommentTableModel.id.in_(alive["comment"]))
+                )
+                comments = result.scalars().all()
+
+        found = {("task", task.id) for task in tasks} | {("comment", comment.id) for comment in comments}
+        deleted = [
+            SchemaTombstone(entity=entity, id=entity_id)
+            for entity, entity_id in last_actions
+            if (entity, entity_id) not in found
+        ]
+        next_cursor = encode_cursor(changes[-1].txid, changes[-1].id) if changes else since
+        return SchemaChanges(
+            tasks=tasks, comments=comments, deleted=deleted, next_cursor=next_cursor, has_more=has_more
+        )
@@ -1,16 +1,19 @@
 from app.tasks.service import TaskService
-from app.projects.service import ProjectService
 from app.exceptions import UserPermissionError, UserIsNotMemberProject
-from app.users.models import UsersTableModel
+from app.users.schemas import SchemaPrincipal
 
-async def check_access_for_comments(
-    task_id: int,
-    current_user: UsersTableModel
-):
+def ensure_comment_access(current_user: SchemaPrincipal, in_project: bool):
     if not (current_user.is_manager or current_user.is_user):
         raise UserPermissionError
-    project_id = await TaskService.get_project_id_by_task_id(task_id)
-    in_project = await ProjectService.user_in_project(project_id, current_user.id)
     if not in_project:
         raise UserIsNotMemberProject
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def check_access_for_comments(
+    task_id: int,
+    current_user: SchemaPrincipal
+):
+    """Проверить доступ к комментариям задачи и вернуть ID её проекта."""
+    project_id, in_project = await TaskService.get_project_membership(task_id, current_user.id)
+    ensure_comment_access(current_user, in_project)
+    return project_id
@@ -1,10 +1,20 @@
 from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, Integer, func, ForeignKey
+from typing import Any
+
+from sqlalchemy import String, DateTime, Boolean, Integer, func, ForeignKey, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
 
 class CommentTableModel(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_comments_task_id_created_at_active", "task_id", "created_at", "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, index=True, comment="Уникальный идентификатор комментария"
@@ -37,5 +47,12 @@ class CommentTableModel(Base):
         comment="Дата и время последнего обновления комментария"
     )
 
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', comment_text)", persisted=True),
+        deferred=True,
+        comment="Полнотекстовый индекс по тексту комментария",
+    )
+
     def __str__(self):
         return f"Comment ID: {self.id}"
\ No newline at end of file
@@ -1,16 +1,17 @@
-from fastapi import APIRouter, status, Depends
-from app.comments.schemas import SchemaComment, SchemaCommentAdd, SchemaCommentUpdate
+from fastapi import APIRouter, status, Depends, Query
+from app.database import get_async_session
+from app.comments.schemas import SchemaComment, SchemaCommentAdd, SchemaCommentUpdate, SchemaCommentPage, SchemaTaskComments
 from app.comments.service import CommentService
 from app.users.dependencies import get_current_user
-from app.users.models import UsersTableModel
+from app.users.schemas import SchemaPrincipal
 
-router = APIRouter(prefix="/comments", tags=["Comments"])
+router = APIRouter(prefix="/comments", tags=["Comments"], dependencies=[Depends(get_async_session)])
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=SchemaComment)
 async def add_comment(
         new_comment: SchemaCommentAdd,
-        current_user: UsersTableModel = Depends(get_current_user)
+        current_user: SchemaPrincipal = Depends(get_current_user)
 ):
     return await CommentService.add_comment(new_comment=new_comment, current_user=current_user)
 
@@ -19,7 +20,7 @@ async def add_comment(
 async def update_comment(
         comment_id: int,
         data: SchemaCommentUpdate,
-        current_user: UsersTableModel = Depends(get_current_user)
+        current_user: SchemaPrincipal = Depends(get_current_user)
 ):
     return await CommentService.update_comment(comment_id=comment_id, data=data, current_user=current_user)
 
@@ -27,14 +28,29 @@ async def update_comment(
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(
         comment_id: int,
-        current_user: UsersTableModel = Depends(get_current_user)
+        current_user: SchemaPrincipal = Depends(get_current_user)
 ):
     return await CommentService.delete_comment(comment_id=comment_id, current_user=current_user)
 
 
-@router.get("/comments-by-task/{task_id}", response_model=list[SchemaComment])
+@router.get("/comments-by-task/{task_id}", response_model=SchemaCommentPage)
 async def get_comments_by_task(
         task_id: int,
-        current_user: UsersTableModel = Depends(get_current_user)
+        limit: int = Query(50, ge=1, le=200, description="Размер страницы"),
+        cursor: str | None = Query(None, description="Курсор следующей страницы из next_cursor"),
+        current_user: SchemaPrincipal = Depends(get_current_user)
 ):
-    return await CommentService.get_comments_by_task_id(task_id=task_id, current_user=current_user)
\ No newline at end of file
+    return await CommentService.get_comments_by_task_id(
+        task_id=task_id, limit=limit, cursor=cursor, current_user=current_user
+    )
+
+
+@router.get("/latest", response_model=list[SchemaTaskComments])
+async def get_latest_comments(
+        task_ids: list[int] = Query(..., min_length=1, max_length=200, description="Идентификаторы задач"),
+        limit: int = Query(5, ge=1, le=50, description="Сколько последних комментариев вернуть на задачу"),
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await CommentService.get_latest_comments_by_task_ids(
+        task_ids=task_ids, limit=limit, current_user=current_user
+    )
@@ -19,4 +19,14 @@ class SchemaComment(SchemaCommentAdd):
 
 class SchemaCommentUpdate(BaseModel):
     """Схема для обновления текста комментария"""
-    comment_text: str | None = Field(None, description="Комментарий пользователя")
\ No newline at end of file
+    comment_text: str | None = Field(None, description="Комментарий пользователя")
+
+class SchemaCommentPage(BaseModel):
+    """Страница ленты комментариев задачи"""
+    items: list[SchemaComment] = Field(..., description="Комментарии по возрастанию даты создания")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы, None если страница последняя")
+
+class SchemaTaskComments(BaseModel):
+    """Последние комментарии одной задачи"""
+    task_id: int = Field(..., description="Идентификатор задачи")
+    comments: list[SchemaComment] = Field(..., description="Комментарии от новых к старым")
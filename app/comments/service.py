@@ -1,47 +1,175 @@
-from app.comments.dependencies import check_access_for_comments
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, exists, tuple_, func
+
+from app.changes.service import ChangeLogService
+from app.comments.dependencies import check_access_for_comments, ensure_comment_access
 from app.comments.exeptions import CommentNotFound, CommentNoPermission
-from app.comments.schemas import SchemaCommentUpdate, SchemaCommentAdd
+from app.comments.schemas import SchemaCommentUpdate, SchemaCommentAdd, SchemaCommentPage, SchemaTaskComments
+from app.database import session_scope, execute_read
+from app.events.service import EventService
+from app.exceptions import UserPermissionError, UserIsNotMemberProject
+from app.projects.association_tables import project_users
+from app.projects.service import remember_membership
 from app.service.base import BaseService
+from app.service.pagination import encode_cursor, decode_cursor
 from app.comments.models import CommentTableModel
-from app.users.models import UsersTableModel
+from app.tasks.exeptions import TaskNotFound
+from app.tasks.models import TaskTableModel
+from app.users.schemas import SchemaPrincipal
 
 
 class CommentService(BaseService):
     model = CommentTableModel
 
     @classmethod
-    async def add_comment(cls, new_comment: SchemaCommentAdd, current_user: UsersTableModel):
-        await check_access_for_comments(new_comment.task_id, current_user)
-        return await CommentService.add(**new_comment.model_dump(), creator_id=current_user.id)
+    async def record_change(cls, session, action: str, comment: CommentTableModel) -> None:
+        project_id = select(TaskTableModel.project_id).where(TaskTableModel.id == comment.task_id).scalar_subquery()
+        await ChangeLogService.record(session, project_id, "comment", action, comment.id)
+
+    @classmethod
+    async def add_comment(cls, new_comment: SchemaCommentAdd, current_user: SchemaPrincipal):
+        project_id = await check_access_for_comments(new_comment.task_id, current_user)
+        comment = await CommentService.add(**new_comment.model_dump(), creator_id=current_user.id)
+        await EventService.publish_comment(project_id, comment.task_id, "created", comment.id)
+        return comment
 
     @classmethod
-    async def update_comment(cls, comment_id: int, data: SchemaCommentUpdate, current_user: UsersTableModel):
-        comment = await CommentService.find_by_id(comment_id)
+    async def find_with_membership(
+            cls, comment_id: int, user_id: int
+    ) -> tuple[Optional[CommentTableModel], Optional[int], bool]:
+        """
+        Одним запросом (comments -> tasks -> project_users) получить комментарий,
+        проект его задачи и членство пользователя в проекте.
+        """
+        in_project = exists().where(
+            project_users.c.project_id == TaskTableModel.project_id,
+            project_users.c.user_id == user_id,
+        )
+        async with session_scope() as session:
+            query = (
+                select(CommentTableModel, TaskTableModel.project_id, in_project)
+                .join(TaskTableModel, TaskTableModel.id == CommentTableModel.task_id)
+                .where(CommentTableModel.id == comment_id)
+            )
+            result = await session.execute(query)
+            row = result.one_or_none()
+        if row is None:
+            return None, None, False
+        comment, project_id, is_member = row
+        remember_membership(project_id, user_id, is_member)
+        return comment, project_id, is_member
+
+    @classmethod
+    async def update_comment(cls, comment_id: int, data: SchemaCommentUpdate, current_user: SchemaPrincipal):
+        comment, project_id, in_project = await CommentService.find_with_membership(comment_id, current_user.id)
         if not comment:
             raise CommentNotFound
         if comment.creator_id != current_user.id:
             raise CommentNoPermission
-        await check_access_for_comments(comment.task_id, current_user)
+        ensure_comment_access(current_user, in_project)
         updated_comment = await CommentService.update_by_id(comment_id, **data.model_dump(exclude_unset=True))
         if not updated_comment:
             raise CommentNotFound
         else:
+            await EventService.publish_comment(project_id, updated_comment.task_id, "updated", comment_id)
             return updated_comment
 
     @classmethod
-    async def delete_comment(cls, comment_id: int, current_user: UsersTableModel):
-        comment = await CommentService.find_by_id(comment_id)
+    async def delete_comment(cls, comment_id: int, current_user: SchemaPrincipal):
+        comment, project_id, in_project = await CommentService.find_with_membership(comment_id, current_user.id)
         if not comment:
             raise CommentNotFound
         if comment.creator_id != current_user.id:
             raise CommentNoPermission
-        await check_access_for_comments(comment.task_id, current_user)
+        ensure_comment_access(current_user, in_project)
         result = await CommentService.delete_by_id(comment_id)
         if not result:
             raise CommentNotFound
+        await EventService.publish_comment(project_id, comment.task_id, "deleted", comment_id)
         return None
 
     @classmethod
-    async def get_comments_by_task_id(cls, task_id: int, current_user: UsersTableModel):
+    async def get_comments_by_task_id(
+            cls,
+            task_id: int,
+            limit: int,
+            cursor: Optional[str],
+            current_user: SchemaPrincipal
+    ) -> SchemaCommentPage:
+        """Лента неудалённых комментариев задачи по (created_at, id) с keyset-пагинацией."""
         await check_access_for_comments(task_id, current_user)
-        return await CommentService.find_all(task_id=task_id)
\ No newline at end of file
+        query = select(CommentTableModel).where(
+            CommentTableModel.task_id == task_id,
+            ~CommentTableModel.is_deleted,
+        )
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor, datetime, int)
+            query = query.where(
+                tuple_(CommentTableModel.created_at, CommentTableModel.id) > tuple_(last_created_at, last_id)
+            )
+        query = query.order_by(CommentTableModel.created_at.asc(), CommentTableModel.id.asc()).limit(limit + 1)
+
+        result = await execute_read(query)
+        comments = result.scalars().all()
+
+        next_cursor = None
+        if len(comments) > limit:
+            comments = comments[:limit]
+            next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+        return SchemaCommentPage(items=comments, next_cursor=next_cursor)
+
+    @classmethod
+    async def get_latest_comments_by_task_ids(
+            cls,
+            task_ids: list[int],
+            limit: int,
+            current_user: SchemaPrincipal
+    ) -> list[SchemaTaskComments]:
+        """
+        Последние limit неудалённых комментариев для каждой задачи из task_ids.
+        Доступ проверяется одним запросом на все задачи, комментарии выбираются одним запросом с row_number().
+        """
+        if not (current_user.is_manager or current_user.is_user):
+            raise UserPermissionError
+        task_ids = list(dict.fromkeys(task_ids))
+        in_project = exists().where(
+            project_users.c.project_id == TaskTableModel.project_id,
+            project_users.c.user_id == current_user.id,
+        )
+        rank = func.row_number().over(
+            partition_by=CommentTableModel.task_id,
+            order_by=(CommentTableModel.created_at.desc(), CommentTableModel.id.desc()),
+        ).label("rank")
+        ranked = (
+            select(CommentTableModel.id, rank)
+            .where(CommentTableModel.task_id.in_(task_ids), ~CommentTableModel.is_deleted)
+            .subquery()
+        )
+
+        async with session_scope() as session:
+            result = await session.execute(
+                select(TaskTableModel.id, TaskTableModel.project_id, in_project)
+                .where(TaskTableModel.id.in_(task_ids))
+            )
+            rows = result.all()
+            if len(rows) != len(task_ids):
+                raise TaskNotFound
+            for _, project_id, is_member in rows:
+                remember_membership(project_id, current_user.id, is_member)
+                if not is_member:
+                    raise UserIsNotMemberProject
+
+        result = await execute_read(
+            select(CommentTableModel)
+            .join(ranked, ranked.c.id == CommentTableModel.id)
+            .where(ranked.c.rank <= limit)
+            .order_by(CommentTableModel.created_at.desc(), CommentTableModel.id.desc())
+        )
+        comments = result.scalars().all()
+
+        by_task = {task_id: [] for task_id in task_ids}
+        for comment in comments:
+            by_task[comment.task_id].append(comment)
+        return [SchemaTaskComments(task_id=task_id, comments=items) for task_id, items in by_task.items()]
@@ -1,10 +1,19 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager, suppress
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Callable, Iterator, Optional
 
-from sqlalchemy import inspect, NullPool
+from sqlalchemy import inspect, NullPool, event, text, Result
+from sqlalchemy.exc import OperationalError, InterfaceError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker, AsyncEngine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from app.config import settings
+from app.service.pool import InstrumentedPool
+from app.service.query_stats import instrument_engine
+from app.service.slow_queries import slow_query_log
 
 ##DATABASE_URL = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASS}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 DATABASE_URL = settings.db_url
@@ -12,11 +21,137 @@ DATABASE_URL = settings.db_url
 if settings.MODE == "TEST":
     DATABASE_PARAMS = {"poolclass": NullPool}
 else:
-    DATABASE_PARAMS = {}
+    DATABASE_PARAMS = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
 
 engine: AsyncEngine = create_async_engine(DATABASE_URL, **DATABASE_PARAMS)
+instrument_engine(engine)
+slow_query_log.watch(engine)
 
-async_session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class PrimarySession(Session):
+    """Сессия primary: отмечает в info["wrote"], что единица работы что-то записала."""
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _mark_flush_write(session, _flush_context) -> None:
+    session.info["wrote"] = True
+
+
+async_session_maker = async_sessionmaker(
+    bind=engine, class_=AsyncSession, sync_session_class=PrimarySession, expire_on_commit=False
+)
+replica_session_maker = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+# Сессия текущей единицы работы (обычно — HTTP-запроса)
+_current_session: ContextVar[Optional[AsyncSession]] = ContextVar("current_session", default=None)
+
+
+class ReadConsistency:
+    """Состояние HTTP-запроса для read-your-writes: читать ли только с primary и была ли запись."""
+
+    def __init__(self, primary_reads: bool):
+        self.primary_reads = primary_reads
+        self.wrote = False
+
+
+_read_consistency: ContextVar[Optional[ReadConsistency]] = ContextVar("read_consistency", default=None)
+
+
+@contextmanager
+def read_consistency_scope(primary_until: Optional[str]) -> Iterator[ReadConsistency]:
+    """primary_until — unix-время из cookie, до которого клиент читает с primary после своей записи."""
+    try:
+        primary_reads = float(primary_until or 0) > time.time()
+    except ValueError:
+        primary_reads = False
+    state = ReadConsistency(primary_reads)
+    token = _read_consistency.set(state)
+    try:
+        yield state
+    finally:
+        _read_consistency.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Распределение чтений по репликам round-robin.
+    Реплика, к которой не удалось обратиться, исключается до следующей успешной проверки здоровья.
+    """
+
+    def __init__(self, urls: list[str], health_interval: float):
+        self.engines: list[AsyncEngine] = [create_async_engine(url, **DATABASE_PARAMS) for url in urls]
+        for replica in self.engines:
+            instrument_engine(replica)
+            slow_query_log.watch(replica)
+        self.health_interval = health_interval
+        self.failovers = 0
+        self._healthy: set[AsyncEngine] = set(self.engines)
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def candidates(self) -> list[AsyncEngine]:
+        """Здоровые реплики, начиная со следующей по кругу."""
+        healthy = [replica for replica in self.engines if replica in self._healthy]
+        if not healthy:
+            return []
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        self._healthy.discard(replica)
+        self.failovers += 1
+
+    async def check(self) -> None:
+        for replica in self.engines:
+            try:
+                async with replica.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=self.health_interval)
+            except (OSError, asyncio.TimeoutError, OperationalError, InterfaceError):
+                self._healthy.discard(replica)
+            else:
+                self._healthy.add(replica)
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_interval)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for replica in self.engines:
+            await replica.dispose()
+
+    def stats(self) -> dict:
+        return {"replicas": len(self.engines), "healthy": len(self._healthy), "failovers": self.failovers}
+
+
+replica_router = ReplicaRouter(settings.DB_REPLICA_URLS, settings.REPLICA_HEALTH_INTERVAL)
 
 class Base(DeclarativeBase):
     pass
@@ -29,6 +164,84 @@ async def check_db_exists() -> bool:
         return bool(tables)
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия единицы работы.
+    Если сессия уже открыта выше по стеку (например, зависимостью get_async_session) — используется она,
+    иначе открывается новая, которая фиксируется одним коммитом при выходе из блока.
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
     async with async_session_maker() as session:
+        token = _current_session.set(session)
+        try:
+            yield session
+            await session.commit()
+        finally:
+            _current_session.reset(token)
+        state = _read_consistency.get()
+        if state is not None and session.info.get("wrote"):
+            state.wrote = True
+        for callback in session.info.pop("after_commit", []):
+            callback()
+
+
+def current_session() -> Optional[AsyncSession]:
+    """Сессия текущей единицы работы, если она открыта."""
+    return _current_session.get()
+
+
+async def release_connection() -> None:
+    """
+    Перед долгим ожиданием без БД (например, bcrypt) вернуть соединение текущей единицы работы в пул,
+    зафиксировав её транзакцию. Если единица работы уже что-то записала, транзакция не прерывается.
+    """
+    session = _current_session.get()
+    if session is None or not session.in_transaction():
+        return
+    if session.info.get("wrote") or session.new or session.dirty or session.deleted:
+        return
+    await session.commit()
+
+
+def _primary_required() -> bool:
+    session = _current_session.get()
+    if session is not None and (session.info.get("wrote") or session.new or session.dirty or session.deleted):
+        return True
+    state = _read_consistency.get()
+    return state is not None and state.primary_reads
+
+
+async def execute_read(statement: Any, allow_replica: bool = True) -> Result:
+    """
+    Выполнить чтение на реплике, если они настроены и ни единица работы, ни недавние запросы клиента
+    ничего не записали; иначе — в сессии primary. При ошибке соединения реплика исключается,
+    а запрос повторяется на следующей, в крайнем случае на primary.
+    """
+    if allow_replica and replica_router.enabled and not _primary_required():
+        for replica in replica_router.candidates():
+            try:
+                async with replica_session_maker(bind=replica) as session:
+                    return await session.execute(statement)
+            except (OSError, OperationalError, InterfaceError):
+                replica_router.mark_down(replica)
+    async with session_scope() as session:
+        return await session.execute(statement)
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Выполнить callback после коммита текущей единицы работы или сразу, если её нет."""
+    session = _current_session.get()
+    if session is None:
+        callback()
+    else:
+        session.info.setdefault("after_commit", []).append(callback)
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with session_scope() as session:
         yield session
\ No newline at end of file
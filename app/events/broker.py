@@ -0,0 +1,104 @@
+import asyncio
+import json
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.config import settings
+from app.service.pg_listener import pg_listener
+
+# Канал NOTIFY, через который события проектов расходятся по всем воркерам
+EVENTS_CHANNEL = "project_events"
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """
+    Очередь событий одного подключения.
+    Повторные события по одной сущности схлопываются в последнее, а при переполнении буфера
+    очередь сбрасывается и клиент получает resync: медленный клиент не копит память воркера.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._pending: OrderedDict = OrderedDict()
+        self._overflowed = False
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict) -> None:
+        if self._overflowed:
+            return
+        key = (event["entity"], event["id"])
+        previous = self._pending.pop(key, None)
+        if previous is not None and previous["action"] == "created" and event["action"] == "updated":
+            event = {**event, "action": "created"}
+        self._pending[key] = event
+        if len(self._pending) > self.max_pending:
+            self._pending.clear()
+            self._overflowed = True
+        self._ready.set()
+
+    def resync(self) -> None:
+        self._pending.clear()
+        self._overflowed = True
+        self._ready.set()
+
+    async def get(self, timeout: float) -> list[dict]:
+        """Дождаться событий и забрать все накопленные; пустой список — истёк таймаут."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        if self._overflowed:
+            self._overflowed = False
+            return [RESYNC_EVENT]
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class EventBroker:
+    """Раздача событий проектов подключениям текущего воркера."""
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+
+    @contextmanager
+    def subscribe(self, project_id: int) -> Iterator[Subscription]:
+        subscription = Subscription(self.max_pending)
+        self._subscribers[project_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers[project_id]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[project_id]
+
+    def publish(self, event: dict) -> None:
+        for subscription in self._subscribers.get(event["project_id"], ()):
+            subscription.push(event)
+
+    def handle_notification(self, payload: str) -> None:
+        self.publish(json.loads(payload))
+
+    def resync_all(self) -> None:
+        """После обрыва LISTEN часть событий потеряна — просим всех клиентов перечитать данные."""
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.resync()
+
+    def stats(self) -> dict:
+        return {
+            "projects": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+        }
+
+
+event_broker = EventBroker(max_pending=settings.EVENTS_MAX_PENDING)
+
+pg_listener.subscribe(EVENTS_CHANNEL, event_broker.handle_notification)
+pg_listener.on_reconnect(event_broker.resync_all)
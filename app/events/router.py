@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from app.events.service import EventService
+from app.projects.service import ProjectService
+from app.users.dependencies import get_current_user
+from app.users.schemas import SchemaPrincipal
+
+router = APIRouter(prefix="/project", tags=["Events"])
+
+
+@router.get("/{project_id}/events")
+async def get_project_events(
+        project_id: int,
+        request: Request,
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    await ProjectService.get_project_by_id(project_id, current_user)
+    return StreamingResponse(
+        EventService.stream(project_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
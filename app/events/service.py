@@ -0,0 +1,48 @@
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from sqlalchemy import select, func
+
+from app.config import settings
+from app.database import session_scope
+from app.events.broker import EVENTS_CHANNEL, event_broker
+
+
+class EventService:
+
+    @classmethod
+    async def publish(
+            cls,
+            project_id: int,
+            entity: str,
+            action: str,
+            entity_id: Optional[int],
+            **extra
+    ) -> None:
+        """
+        Отправить событие проекта через NOTIFY в транзакции текущей единицы работы.
+        Postgres доставит его слушателям всех воркеров только после коммита, при откате событие пропадёт.
+        """
+        payload = json.dumps(
+            {"type": "change", "project_id": project_id, "entity": entity, "action": action, "id": entity_id, **extra}
+        )
+        async with session_scope() as session:
+            await session.execute(select(func.pg_notify(EVENTS_CHANNEL, payload)))
+
+    @classmethod
+    async def publish_comment(cls, project_id: int, task_id: int, action: str, comment_id: int) -> None:
+        """project_id берётся из проверки доступа к задаче, отдельным запросом не читается."""
+        await cls.publish(project_id, "comment", action, comment_id, task_id=task_id)
+
+    @classmethod
+    async def stream(cls, project_id: int, request: Request) -> AsyncIterator[str]:
+        """Поток Server-Sent Events проекта; комментарий-пинг раз в EVENTS_HEARTBEAT_INTERVAL держит соединение."""
+        with event_broker.subscribe(project_id) as subscription:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                events = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_INTERVAL)
+                if not events:
+                    yield ": ping\n\n"
+                    continue
+                yield "".join(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" for event in events)
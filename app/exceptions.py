@@ -44,6 +44,11 @@ UserIsNotActive = HTTPException(
     detail="User is not active"
 )
 
+InvalidCursor = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Invalid pagination cursor"
+)
+
 class UserAlreadyExistsException(HTTPException):
     def __init__(self, detail: str = "User already exists"):
         super().__init__(status_code=400, detail=detail)
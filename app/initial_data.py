@@ -1,5 +1,5 @@
 from app.database import check_db_exists, Base, engine
-from app.users.hashing import get_password_hash
+from app.users.hashing import get_password_hash_async
 
 from app.users.service import UsersService
 
@@ -17,7 +17,7 @@ async def init_db():
     admin_exists = await UsersService.find_one_or_none(username="admin")
     if not admin_exists:
         print("Создаём администратора...")
-        hashed_password = get_password_hash("admin")
+        hashed_password = await get_password_hash_async("admin")
         await UsersService.add(
             email="admin@admin.ru",
             hash_password=hashed_password,
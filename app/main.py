@@ -1,30 +1,75 @@
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from sqladmin import Admin
 
 from app.admin.auth import authentication_backend
 from app.admin.views import UserAdmin, ProjectAdmin, TaskAdmin, CommentAdmin
-from app.database import engine
+from app.config import settings
+from app.database import engine, replica_router, read_consistency_scope
 
 from app.initial_data import init_db
+from app.users.hashing import hashing_executor
+from app.service.pg_listener import pg_listener
+from app.service.query_stats import query_stats_scope, request_query_headers
 from app.projects.router import router as router_projects
+from app.projects.service import membership_memo_scope
 from app.tasks.router import router as router_tasks
+from app.changes.router import router as router_changes
 from app.comments.router import router as router_comments
+from app.events.router import router as router_events
+from app.metrics.router import router as router_metrics
+from app.search.router import router as router_search
+from app.stats.router import router as router_stats
 from app.users.router import router as router_users
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
+    pg_listener.start()
+    replica_router.start()
     yield
+    await replica_router.stop()
+    await pg_listener.stop()
+    hashing_executor.shutdown()
 
 app = FastAPI(lifespan=lifespan)
 
+
+# Cookie, до истечения которой клиент после своей записи читает с primary, а не с реплик
+READ_PRIMARY_COOKIE = "task_manager_read_primary_until"
+
+
+@app.middleware("http")
+async def request_scope_middleware(request: Request, call_next):
+    with (
+        membership_memo_scope(),
+        read_consistency_scope(request.cookies.get(READ_PRIMARY_COOKIE)) as consistency,
+        query_stats_scope() as query_stats,
+    ):
+        response = await call_next(request)
+    response.headers.update(request_query_headers(request.method, request.url.path, query_stats))
+    if consistency.wrote and replica_router.enabled:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + settings.READ_YOUR_WRITES_WINDOW),
+            max_age=settings.READ_YOUR_WRITES_WINDOW,
+            httponly=True,
+        )
+    return response
+
+
 app.include_router(router_tasks)
 app.include_router(router_projects)
 app.include_router(router_comments)
 app.include_router(router_users)
+app.include_router(router_search)
+app.include_router(router_events)
+app.include_router(router_changes)
+app.include_router(router_stats)
+app.include_router(router_metrics)
 
 admin = Admin(app, engine, authentication_backend=authentication_backend)
 
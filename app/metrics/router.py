@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+
+from app.metrics.service import MetricsService
+from app.users.dependencies import get_current_admin_user
+from app.users.schemas import SchemaPrincipal
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/")
+async def get_metrics(_: SchemaPrincipal = Depends(get_current_admin_user)):
+    return MetricsService.collect()
@@ -0,0 +1,32 @@
+from app.database import engine, replica_router
+from app.events.broker import event_broker
+from app.projects.cache import prefix_cache
+from app.service.cache import model_caches
+from app.service.pg_listener import pg_listener
+from app.service.pool import pool_stats
+from app.service.slow_queries import slow_query_log
+from app.users.cache import principal_cache
+from app.users.hashing import hashing_executor
+
+
+class MetricsService:
+
+    @classmethod
+    def collect(cls) -> dict:
+        """Снимок метрик текущего воркера: пулы соединений, кэши, хеширование, фоновые соединения и медленные запросы."""
+        return {
+            "pools": {
+                "primary": pool_stats(engine.sync_engine.pool),
+                "replicas": [pool_stats(replica.sync_engine.pool) for replica in replica_router.engines],
+            },
+            "replicas": replica_router.stats(),
+            "caches": {
+                "principal": principal_cache.stats(),
+                "project_prefix": prefix_cache.stats(),
+                "models": {name: cache.stats() for name, cache in model_caches.items()},
+            },
+            "hashing": hashing_executor.stats(),
+            "listener": pg_listener.stats(),
+            "events": event_broker.stats(),
+            "slow_queries": slow_query_log.stats(),
+        }
@@ -13,6 +13,8 @@ from app.tasks.models import TaskTableModel
 from app.projects.models import ProjectTableModel
 from app.comments.models import CommentTableModel
 from app.users.models import UsersTableModel
+from app.changes.models import ChangeLogTableModel
+from app.stats.models import ProjectTaskStatsTableModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,28 @@
+"""add tasks assignee index
+
+Revision ID: 4f1d2b8e6a90
+Revises: c3b95d07e1a6
+Create Date: 2026-10-18 14:20:09.354716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1d2b8e6a90'
+down_revision: Union[str, None] = 'c3b95d07e1a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_assignee_id_status_due_date', 'tasks', ['assignee_id', 'status', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assignee_id_status_due_date', table_name='tasks')
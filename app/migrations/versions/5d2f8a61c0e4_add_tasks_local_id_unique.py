@@ -0,0 +1,55 @@
+"""add tasks local id unique
+
+Revision ID: 5d2f8a61c0e4
+Revises: b7c41e9d2a53
+Create Date: 2026-10-18 11:03:17.884120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8a61c0e4'
+down_revision: Union[str, None] = 'b7c41e9d2a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Повторы номеров в проекте: первая по id задача сохраняет номер, остальные получают новые после максимума
+    op.execute("""
+    WITH copies AS (
+        SELECT id, project_id,
+               row_number() OVER (PARTITION BY project_id, local_task_id ORDER BY id) AS copy
+        FROM tasks
+    ),
+    duplicates AS (
+        SELECT id, project_id, row_number() OVER (PARTITION BY project_id ORDER BY id) AS n
+        FROM copies
+        WHERE copy > 1
+    ),
+    maxes AS (
+        SELECT project_id, max(local_task_id) AS max_local_task_id FROM tasks GROUP BY project_id
+    )
+    UPDATE tasks
+    SET local_task_id = maxes.max_local_task_id + duplicates.n
+    FROM duplicates JOIN maxes USING (project_id)
+    WHERE tasks.id = duplicates.id
+    """)
+    # last_task_id — следующий свободный номер проекта
+    op.execute("""
+    UPDATE projects
+    SET last_task_id = maxes.max_local_task_id + 1
+    FROM (SELECT project_id, max(local_task_id) AS max_local_task_id FROM tasks GROUP BY project_id) AS maxes
+    WHERE projects.id = maxes.project_id AND projects.last_task_id <= maxes.max_local_task_id
+    """)
+    op.create_unique_constraint('uq_tasks_project_id_local_task_id', 'tasks', ['project_id', 'local_task_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_tasks_project_id_local_task_id', 'tasks', type_='unique')
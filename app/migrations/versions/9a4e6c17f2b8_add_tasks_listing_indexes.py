@@ -0,0 +1,36 @@
+"""add tasks listing indexes
+
+Revision ID: 9a4e6c17f2b8
+Revises: 5d2f8a61c0e4
+Create Date: 2026-10-18 12:26:05.117352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e6c17f2b8'
+down_revision: Union[str, None] = '5d2f8a61c0e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_id_status_local_task_id', 'tasks', ['project_id', 'status', 'local_task_id'], unique=False)
+    op.create_index('ix_tasks_project_id_assignee_id_local_task_id', 'tasks', ['project_id', 'assignee_id', 'local_task_id'], unique=False)
+    op.create_index('ix_tasks_project_id_priority_id', 'tasks', ['project_id', 'priority', 'id'], unique=False)
+    op.create_index('ix_tasks_project_id_created_at_id', 'tasks', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_project_id_due_date', 'tasks', ['project_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_id_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_priority_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_assignee_id_local_task_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status_local_task_id', table_name='tasks')
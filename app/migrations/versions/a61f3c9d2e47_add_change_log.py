@@ -0,0 +1,40 @@
+"""add change log
+
+Revision ID: a61f3c9d2e47
+Revises: e8a07c3d5b21
+Create Date: 2026-10-18 15:48:13.204716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61f3c9d2e47'
+down_revision: Union[str, None] = 'e8a07c3d5b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_log',
+    sa.Column('id', sa.BigInteger(), nullable=False, comment='Порядковый номер записи'),
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='ID проекта'),
+    sa.Column('entity', sa.String(length=20), nullable=False, comment='Тип сущности: task или comment'),
+    sa.Column('entity_id', sa.Integer(), nullable=False, comment='ID изменённой сущности'),
+    sa.Column('action', sa.String(length=10), nullable=False, comment='created, updated или deleted'),
+    sa.Column('txid', sa.BigInteger(), server_default=sa.text('txid_current()'), nullable=False, comment='ID транзакции, записавшей изменение'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Дата и время изменения'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_change_log_project_id_txid_id', 'change_log', ['project_id', 'txid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_change_log_project_id_txid_id', table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,28 @@
+"""add project_users user index
+
+Revision ID: b7c41e9d2a53
+Revises: e40ca6b14371
+Create Date: 2026-10-18 10:12:41.532907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41e9d2a53'
+down_revision: Union[str, None] = 'e40ca6b14371'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_project_users_user_id_project_id', 'project_users', ['user_id', 'project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_users_user_id_project_id', table_name='project_users')
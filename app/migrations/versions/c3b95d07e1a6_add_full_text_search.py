@@ -0,0 +1,51 @@
+"""add full text search
+
+Revision ID: c3b95d07e1a6
+Revises: 9a4e6c17f2b8
+Create Date: 2026-10-18 13:41:52.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3b95d07e1a6'
+down_revision: Union[str, None] = '9a4e6c17f2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=False,
+        comment='Полнотекстовый индекс по названию и описанию задачи',
+    ))
+    op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False, postgresql_using='gin')
+    op.add_column('comments', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', comment_text)", persisted=True),
+        nullable=False,
+        comment='Полнотекстовый индекс по тексту комментария',
+    ))
+    op.create_index('ix_comments_search_vector', 'comments', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_search_vector', table_name='comments', postgresql_using='gin')
+    op.drop_column('comments', 'search_vector')
+    op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_using='gin')
+    op.drop_column('tasks', 'search_vector')
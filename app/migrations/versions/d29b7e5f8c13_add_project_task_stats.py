@@ -0,0 +1,50 @@
+"""add project task stats
+
+Revision ID: d29b7e5f8c13
+Revises: a61f3c9d2e47
+Create Date: 2026-10-18 16:21:37.550184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.stats.models import STATS_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd29b7e5f8c13'
+down_revision: Union[str, None] = 'a61f3c9d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_task_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='ID проекта'),
+    sa.Column('dimension', sa.String(length=20), nullable=False, comment='Разрез: status, priority или assignee'),
+    sa.Column('value', sa.Integer(), nullable=False, comment='Значение разреза'),
+    sa.Column('task_count', sa.Integer(), nullable=False, comment='Число задач'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'dimension', 'value')
+    )
+    for statement in STATS_DDL:
+        op.execute(statement)
+    op.execute("""
+    INSERT INTO project_task_stats (project_id, dimension, value, task_count)
+    SELECT project_id, 'status', status, count(*) FROM tasks GROUP BY project_id, status
+    UNION ALL
+    SELECT project_id, 'priority', priority, count(*) FROM tasks GROUP BY project_id, priority
+    UNION ALL
+    SELECT project_id, 'assignee', assignee_id, count(*) FROM tasks GROUP BY project_id, assignee_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_update ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS tasks_stats_insert_delete ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS project_task_stats_apply()")
+    op.drop_table('project_task_stats')
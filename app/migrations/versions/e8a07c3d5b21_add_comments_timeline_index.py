@@ -0,0 +1,31 @@
+"""add comments timeline index
+
+Revision ID: e8a07c3d5b21
+Revises: 4f1d2b8e6a90
+Create Date: 2026-10-18 15:02:44.918273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a07c3d5b21'
+down_revision: Union[str, None] = '4f1d2b8e6a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_comments_task_id_created_at_active', 'comments', ['task_id', 'created_at', 'id'],
+        unique=False, postgresql_where=sa.text('NOT is_deleted'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_task_id_created_at_active', table_name='comments')
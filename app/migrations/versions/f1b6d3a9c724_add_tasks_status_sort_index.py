@@ -0,0 +1,28 @@
+"""add tasks status sort index
+
+Revision ID: f1b6d3a9c724
+Revises: d29b7e5f8c13
+Create Date: 2026-10-18 19:12:37.540816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d3a9c724'
+down_revision: Union[str, None] = 'd29b7e5f8c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_id_status_id', 'tasks', ['project_id', 'status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_id_status_id', table_name='tasks')
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.database import Base
 
 project_users = Table(
@@ -6,4 +6,5 @@ project_users = Table(
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_project_users_user_id_project_id", "user_id", "project_id"),
 )
\ No newline at end of file
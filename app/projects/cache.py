@@ -0,0 +1,8 @@
+from app.config import settings
+from app.service.cache import TTLCache
+from app.service.invalidation import register_cache
+
+# Соответствие префикса проекта его id. Префиксы уникальны и почти не меняются,
+# кэш сбрасывается ProjectService при создании, изменении и удалении проектов.
+prefix_cache = TTLCache(maxsize=settings.PROJECT_PREFIX_CACHE_SIZE, ttl=settings.PROJECT_PREFIX_CACHE_TTL)
+register_cache("project_prefix", lambda _: prefix_cache.clear(), prefix_cache.clear)
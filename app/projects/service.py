@@ -1,62 +1,121 @@
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
 
 from app.exceptions import UserPermissionError
 from app.projects.exeptions import (
     UserAlreadyInProject, CannotRemoveCreator, UserNotInProject, NewCreatorNotFound,
     NewCreatorMustBeManager, ProjectAlreadyInactive, ProjectMustBeInactive
 )
+from app.projects.association_tables import project_users
+from app.projects.cache import prefix_cache
 from app.projects.models import ProjectTableModel
 from app.projects.schemas import SchemaProject, SchemaProjectAdd, SchemaProjectUpdate
 from app.tasks.exeptions import ProjectNotFound
 from app.users.exeptions import UserNotFound
 from app.users.models import UsersTableModel
-from app.database import async_session_maker
+from app.database import session_scope, after_commit
 
-from sqlalchemy import or_
+from sqlalchemy import or_, exists, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
 from app.service.base import BaseService
-from app.users.schemas import SchemaUser
+from app.service.cache import MISSING, make_model_cache
+from app.service.invalidation import publish_invalidation
+from app.users.schemas import SchemaUser, SchemaPrincipal
 from app.users.service import UsersService
 
+# Результаты проверок членства в рамках одного HTTP-запроса: (project_id, user_id) -> bool
+_membership_memo: ContextVar[Optional[dict]] = ContextVar("membership_memo", default=None)
+
+
+@contextmanager
+def membership_memo_scope() -> Iterator[None]:
+    """Открывает кэш проверок членства на время обработки запроса."""
+    token = _membership_memo.set({})
+    try:
+        yield
+    finally:
+        _membership_memo.reset(token)
+
+
+def remember_membership(project_id: int, user_id: int, in_project: bool) -> None:
+    """Сохранить результат проверки членства, полученный другим запросом."""
+    memo = _membership_memo.get()
+    if memo is not None:
+        memo[(project_id, user_id)] = in_project
+
+
+def _forget_membership(project_id: int, user_id: int) -> None:
+    memo = _membership_memo.get()
+    if memo is not None:
+        memo.pop((project_id, user_id), None)
+
+
 class ProjectService(BaseService):
     model = ProjectTableModel
+    # last_task_id меняется при каждом создании задачи и из кэша не читается
+    cache = make_model_cache(ProjectTableModel, exclude=("last_task_id",))
 
     @classmethod
-    async def _find_by_id_inner(cls, project_id: int, session) -> Optional[ProjectTableModel]:
-        result = await session.execute(
-            select(ProjectTableModel)
-            .options(selectinload(ProjectTableModel.users))
-            .where(ProjectTableModel.id == project_id)
-        )
-        project = result.scalar_one_or_none()
-        if not project:
-            raise ProjectNotFound
+    async def add(cls, **data) -> ProjectTableModel:
+        project = await super().add(**data)
+        after_commit(prefix_cache.clear)
+        await publish_invalidation("project_prefix")
+        return project
+
+    @classmethod
+    async def update_by_id(cls, object_id: int, **data) -> Optional[ProjectTableModel]:
+        project = await super().update_by_id(object_id, **data)
+        after_commit(prefix_cache.clear)
+        await publish_invalidation("project_prefix")
         return project
 
     @classmethod
-    async def find_project_by_id(cls, project_id: int, db_session=None) -> ProjectTableModel:
+    async def delete_by_id(cls, object_id: int) -> bool:
+        result = await super().delete_by_id(object_id)
+        after_commit(prefix_cache.clear)
+        await publish_invalidation("project_prefix")
+        return result
+
+    @classmethod
+    async def get_project_id_by_prefix(cls, project_prefix: str) -> int:
+        """Получить id проекта по его префиксу (например, ABC в ABC-123)."""
+        project_prefix = project_prefix.upper()
+        project_id = prefix_cache.get(project_prefix)
+        if project_id is MISSING:
+            async with session_scope() as session:
+                result = await session.execute(
+                    select(ProjectTableModel.id).where(ProjectTableModel.prefix_name == project_prefix)
+                )
+                project_id = result.scalar_one_or_none()
+            if project_id is None:
+                raise ProjectNotFound
+            prefix_cache.set(project_prefix, project_id)
+        return project_id
+
+    @classmethod
+    async def find_project_by_id(cls, project_id: int) -> ProjectTableModel:
         """
-        Получить проект по id.
-        Если db_session не передан — создаём и управляем собственной сессией.
-        Если db_session передан — используем её (например, для модификации объекта).
+        Получить проект по id вместе с участниками.
+        Внутри единицы работы возвращается объект её сессии, его можно модифицировать.
         """
-        should_open_session = False
-        if db_session is None:
-            db_session = async_session_maker()
-            should_open_session = True
-
-        if should_open_session:
-            async with db_session as session:
-                return await cls._find_by_id_inner(project_id, session)
-        else:
-            return await cls._find_by_id_inner(project_id, db_session)
+        async with session_scope() as session:
+            result = await session.execute(
+                select(ProjectTableModel)
+                .options(selectinload(ProjectTableModel.users))
+                .where(ProjectTableModel.id == project_id)
+            )
+            project = result.scalar_one_or_none()
+            if not project:
+                raise ProjectNotFound
+            return project
 
     @classmethod
-    async def add_user_to_project(cls, project_id: int, user_id: int, current_user: UsersTableModel):
-        async with async_session_maker() as session:
-            project = await cls.find_project_by_id(project_id, session)
+    async def add_user_to_project(cls, project_id: int, user_id: int, current_user: SchemaPrincipal):
+        async with session_scope() as session:
+            project = await cls.find_project_by_id(project_id)
             if not (current_user.is_manager and project.creator_id == current_user.id):
                 raise UserPermissionError
             user = await session.get(UsersTableModel, user_id)
@@ -66,13 +125,14 @@ class ProjectService(BaseService):
                 raise UserAlreadyInProject
             project.users.append(user)
             session.add(project)
-            await session.commit()
+            await session.flush()
+            _forget_membership(project_id, user_id)
             return {"detail": "User added to project"}
 
     @classmethod
-    async def remove_user_from_project(cls, project_id: int, user_id: int, current_user: UsersTableModel):
-        async with async_session_maker() as session:
-            project = await cls.find_project_by_id(project_id, session)
+    async def remove_user_from_project(cls, project_id: int, user_id: int, current_user: SchemaPrincipal):
+        async with session_scope() as session:
+            project = await cls.find_project_by_id(project_id)
             if not (current_user.is_manager and project.creator_id == current_user.id):
                 raise UserPermissionError
             if user_id == project.creator_id:
@@ -84,24 +144,35 @@ class ProjectService(BaseService):
                 raise UserNotInProject
             project.users.remove(next(u for u in project.users if u.id == user.id))
             session.add(project)
-            await session.commit()
+            await session.flush()
+            _forget_membership(project_id, user_id)
             return None
 
     @classmethod
     async def user_in_project(cls, project_id: int, user_id: int) -> bool:
-        if cls.model is None:
-            raise NotImplementedError("Model must be set for BaseService subclass")
-        try:
-            project = await cls.find_project_by_id(project_id)
-        except ProjectNotFound:
-            return False
-        return any(user.id == user_id for user in project.users)
+        memo = _membership_memo.get()
+        key = (project_id, user_id)
+        if memo is not None and key in memo:
+            return memo[key]
+        async with session_scope() as session:
+            result = await session.execute(
+                select(
+                    exists().where(
+                        project_users.c.project_id == project_id,
+                        project_users.c.user_id == user_id,
+                    )
+                )
+            )
+            in_project = result.scalar()
+        if memo is not None:
+            memo[key] = in_project
+        return in_project
 
     @classmethod
     async def find_by_user_id(cls, user_id: int) -> list[SchemaProject]:
         if cls.model is None:
             raise NotImplementedError("Model must be set for BaseService subclass")
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             result = await session.execute(
                 select(ProjectTableModel)
                 .where(
@@ -115,13 +186,13 @@ class ProjectService(BaseService):
             return [SchemaProject.model_validate(project) for project in projects]
 
     @classmethod
-    async def get_all_project(cls, current_user: UsersTableModel):
+    async def get_all_project(cls, current_user: SchemaPrincipal):
         if current_user.is_admin:
             return await ProjectService.find_all()
         return await cls.find_by_user_id(current_user.id)
 
     @classmethod
-    async def get_project_by_id(cls, project_id: int, current_user: UsersTableModel):
+    async def get_project_by_id(cls, project_id: int, current_user: SchemaPrincipal):
         project = await cls.find_project_by_id(project_id)
         if (
             current_user.is_admin
@@ -132,7 +203,7 @@ class ProjectService(BaseService):
         raise UserPermissionError
 
     @classmethod
-    async def add_project(cls, new_project: SchemaProjectAdd, current_user: UsersTableModel):
+    async def add_project(cls, new_project: SchemaProjectAdd, current_user: SchemaPrincipal):
         if current_user.is_manager:
             current_project = await ProjectService.add(**new_project.model_dump(), creator_id=current_user.id)
             await cls.add_user_to_project(current_project.id, current_user.id, current_user)
@@ -144,7 +215,7 @@ class ProjectService(BaseService):
             cls,
             project_id: int,
             data: SchemaProjectUpdate,
-            current_user: UsersTableModel
+            current_user: SchemaPrincipal
     ):
         project = await cls.find_project_by_id(project_id)
         if current_user.is_manager and project.creator_id == current_user.id:
@@ -160,7 +231,7 @@ class ProjectService(BaseService):
         raise UserPermissionError
 
     @classmethod
-    async def inactivate_project(cls, project_id: int, current_user: UsersTableModel):
+    async def inactivate_project(cls, project_id: int, current_user: SchemaPrincipal):
         project = await cls.find_project_by_id(project_id)
         if not (current_user.is_manager and project.creator_id == current_user.id):
             raise UserPermissionError
@@ -169,7 +240,7 @@ class ProjectService(BaseService):
         return await ProjectService.update_by_id(project_id, is_active=False)
 
     @classmethod
-    async def delete_project(cls, project_id: int, current_user: UsersTableModel):
+    async def delete_project(cls, project_id: int, current_user: SchemaPrincipal):
         project = await cls.find_project_by_id(project_id)
         if not current_user.is_admin:
             raise UserPermissionError
@@ -179,7 +250,7 @@ class ProjectService(BaseService):
         return None
 
     @classmethod
-    async def get_project_users(cls, project_id: int, current_user: UsersTableModel):
+    async def get_project_users(cls, project_id: int, current_user: SchemaPrincipal):
         project = await cls.find_project_by_id(project_id)
         if not (
             current_user.is_admin
@@ -190,21 +261,20 @@ class ProjectService(BaseService):
         return [SchemaUser.model_validate(user) for user in project.users]
 
     @classmethod
-    async def get_last_task_id(cls, project_id: int) -> int:
+    async def reserve_local_task_ids(cls, project_id: int, session, count: int = 1) -> int:
         """
-        Получить текущий last_task_id для проекта.
+        Зарезервировать count последовательных номеров задач в проекте и вернуть первый из них.
+        UPDATE блокирует строку проекта до конца транзакции сессии,
+        поэтому параллельные вызовы не получат одинаковые номера.
         """
-        project = await cls.find_project_by_id(project_id)
-        return project.last_task_id
-
-    @classmethod
-    async def increment_last_task_id(cls, project_id: int) -> int:
-        """
-        Инкрементировать last_task_id для проекта и вернуть новое значение.
-        """
-        async with async_session_maker() as session:
-            project = await cls.find_project_by_id(project_id, session)
-            project.last_task_id += 1
-            session.add(project)
-            await session.commit()
-            return project.last_task_id
\ No newline at end of file
+        result = await session.execute(
+            update(ProjectTableModel)
+            .where(ProjectTableModel.id == project_id)
+            .values(last_task_id=ProjectTableModel.last_task_id + count)
+            .returning(ProjectTableModel.last_task_id)
+            .execution_options(synchronize_session=False)
+        )
+        last_task_id = result.scalar_one_or_none()
+        if last_task_id is None:
+            raise ProjectNotFound
+        return last_task_id - count
\ No newline at end of file
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.database import get_async_session
+from app.search.schemas import SchemaSearchPage
+from app.search.service import SearchService
+from app.users.dependencies import get_current_user
+from app.users.schemas import SchemaPrincipal
+
+router = APIRouter(prefix="/search", tags=["Search"], dependencies=[Depends(get_async_session)])
+
+
+@router.get("/", response_model=SchemaSearchPage)
+async def search(
+        q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+        project_id: int | None = Query(None, description="Искать только в этом проекте"),
+        limit: int = Query(20, ge=1, le=100, description="Размер страницы"),
+        cursor: str | None = Query(None, description="Курсор следующей страницы из next_cursor"),
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await SearchService.search(q, project_id, limit, cursor, current_user)
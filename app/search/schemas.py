@@ -0,0 +1,18 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class SchemaSearchHit(BaseModel):
+    """Найденная задача или комментарий"""
+    kind: Literal["task", "comment"] = Field(..., description="Тип найденного объекта")
+    id: int = Field(..., description="ID задачи или комментария")
+    project_id: int = Field(..., description="ID проекта")
+    task_id: int = Field(..., description="ID задачи (для задачи совпадает с id)")
+    title: str | None = Field(None, description="Название задачи")
+    text: str | None = Field(None, description="Описание задачи или текст комментария")
+    rank: float = Field(..., description="Релевантность")
+
+class SchemaSearchPage(BaseModel):
+    items: list[SchemaSearchHit] = Field(..., description="Результаты поиска, по убыванию релевантности")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы, None если страница последняя")
@@ -0,0 +1,88 @@
+from sqlalchemy import select, func, literal, null, union_all, tuple_, cast
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from app.comments.models import CommentTableModel
+from app.database import execute_read
+from app.exceptions import UserPermissionError
+from app.projects.association_tables import project_users
+from app.search.schemas import SchemaSearchHit, SchemaSearchPage
+from app.service.pagination import encode_cursor, decode_cursor
+from app.tasks.dependencies import check_access_for_tasks
+from app.tasks.models import TaskTableModel
+from app.users.schemas import SchemaPrincipal
+
+# Должна совпадать с конфигурацией в выражениях search_vector моделей
+SEARCH_CONFIG = "simple"
+
+
+class SearchService:
+
+    @classmethod
+    async def search(
+            cls,
+            q: str,
+            project_id: int | None,
+            limit: int,
+            cursor: str | None,
+            current_user: SchemaPrincipal
+    ) -> SchemaSearchPage:
+        """
+        Полнотекстовый поиск по задачам и комментариям проектов, в которых состоит пользователь.
+        Результаты упорядочены по (rank, kind, id) по убыванию и листаются курсором.
+        """
+        if project_id is not None:
+            await check_access_for_tasks(project_id, current_user)
+            project_filter = TaskTableModel.project_id == project_id
+        else:
+            if not (current_user.is_manager or current_user.is_user):
+                raise UserPermissionError
+            project_filter = TaskTableModel.project_id.in_(
+                select(project_users.c.project_id).where(project_users.c.user_id == current_user.id)
+            )
+
+        ts_query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), q)
+        tasks = (
+            select(
+                literal("task").label("kind"),
+                TaskTableModel.id.label("id"),
+                TaskTableModel.project_id.label("project_id"),
+                TaskTableModel.id.label("task_id"),
+                TaskTableModel.name.label("title"),
+                TaskTableModel.description.label("text"),
+                func.ts_rank(TaskTableModel.search_vector, ts_query).label("rank"),
+            )
+            .where(TaskTableModel.search_vector.bool_op("@@")(ts_query), project_filter)
+        )
+        comments = (
+            select(
+                literal("comment").label("kind"),
+                CommentTableModel.id.label("id"),
+                TaskTableModel.project_id.label("project_id"),
+                CommentTableModel.task_id.label("task_id"),
+                null().label("title"),
+                CommentTableModel.comment_text.label("text"),
+                func.ts_rank(CommentTableModel.search_vector, ts_query).label("rank"),
+            )
+            .join(TaskTableModel, TaskTableModel.id == CommentTableModel.task_id)
+            .where(
+                CommentTableModel.search_vector.bool_op("@@")(ts_query),
+                ~CommentTableModel.is_deleted,
+                project_filter,
+            )
+        )
+        hits = union_all(tasks, comments).subquery()
+        query = select(hits)
+        if cursor:
+            last_rank, last_kind, last_id = decode_cursor(cursor, (int, float), str, int)
+            query = query.where(tuple_(hits.c.rank, hits.c.kind, hits.c.id) < tuple_(last_rank, last_kind, last_id))
+        query = query.order_by(hits.c.rank.desc(), hits.c.kind.desc(), hits.c.id.desc()).limit(limit + 1)
+
+        result = await execute_read(query)
+        rows = result.mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last["rank"], last["kind"], last["id"])
+        return SchemaSearchPage(items=[SchemaSearchHit(**row) for row in rows], next_cursor=next_cursor)
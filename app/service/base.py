@@ -4,39 +4,94 @@ from fastapi import HTTPException, status
 from sqlalchemy import select, insert, update
 from sqlalchemy.exc import IntegrityError
 
-from app.database import async_session_maker
+from app.database import session_scope, after_commit, current_session, execute_read
+from app.service.cache import ModelCache, MISSING
+from app.service.invalidation import publish_invalidation
 
 
+def integrity_error_to_http(e: IntegrityError) -> HTTPException:
+    """Нарушение ограничения БД -> 400 вместо 500."""
+    if "prefix_name" in str(e):
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Project with this prefix name already exists"
+        )
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Database integrity error"
+    )
+
 
 class BaseService:
     model: Type[Any] = None
+    # Включается в подклассе: cache = make_model_cache(Model)
+    cache: Optional[ModelCache] = None
+
+    @classmethod
+    def _cache_for(cls) -> Optional[ModelCache]:
+        """Кэш модели, если он включён и модель не менялась в текущей единице работы (read-your-writes)."""
+        session = current_session()
+        if cls.cache is None or (session is not None and cls.model in session.info.get("cache_bypass", ())):
+            return None
+        return cls.cache
+
+    @classmethod
+    async def invalidate_cache(cls, session, object_id: Any) -> None:
+        """
+        Сбросить кэш объекта после коммита в этом воркере и через NOTIFY в остальных;
+        до коммита чтения этой модели в единице работы идут мимо кэша.
+        """
+        if cls.cache is None:
+            return
+        session.info.setdefault("cache_bypass", set()).add(cls.model)
+        cache = cls.cache
+        after_commit(lambda: cache.invalidate(object_id))
+        await publish_invalidation(cache.name, object_id)
+
+    @classmethod
+    async def record_change(cls, session, action: str, obj: Any) -> None:
+        """Вызывается в транзакции add / update_by_id / delete_by_id; переопределяется для журнала изменений."""
 
     @classmethod
     async def find_by_id(cls, model_id: int) -> Optional[Any]:
         if cls.model is None:
             raise NotImplementedError("Model must be set for BaseService subclass")
-        async with async_session_maker() as session:
-            query = select(cls.model).where(cls.model.id == model_id)
-            result = await session.execute(query)
-            return result.scalar_one_or_none()
+        cache = cls._cache_for()
+        if cache is not None:
+            obj = cache.get_by_id(model_id)
+            if obj is not MISSING:
+                return obj
+        # Кэшируемые модели читаются с primary, чтобы отставание реплики не попадало в кэш
+        query = select(cls.model).where(cls.model.id == model_id)
+        result = await execute_read(query, allow_replica=cls.cache is None)
+        obj = result.scalar_one_or_none()
+        if cache is not None:
+            cache.set_by_id(model_id, obj)
+        return obj
 
     @classmethod
     async def find_one_or_none(cls, **filter_by) -> Optional[Any]:
         if cls.model is None:
             raise NotImplementedError("Model must be set for BaseService subclass")
-        async with async_session_maker() as session:
-            query = select(cls.model).filter_by(**filter_by)
-            result = await session.execute(query)
-            return result.scalar_one_or_none()
+        cache = cls._cache_for()
+        if cache is not None:
+            obj = cache.get_one(filter_by)
+            if obj is not MISSING:
+                return obj
+        query = select(cls.model).filter_by(**filter_by)
+        result = await execute_read(query, allow_replica=cls.cache is None)
+        obj = result.scalar_one_or_none()
+        if cache is not None:
+            cache.set_one(filter_by, obj)
+        return obj
 
     @classmethod
     async def find_all(cls, **filter_by) -> list[Any]:
         if cls.model is None:
             raise NotImplementedError("Model must be set for BaseService subclass")
-        async with async_session_maker() as session:
-            query = select(cls.model).filter_by(**filter_by)
-            result = await session.execute(query)
-            return result.scalars().all()
+        query = select(cls.model).filter_by(**filter_by)
+        result = await execute_read(query)
+        return result.scalars().all()
 
     @classmethod
     async def add(cls, **data) -> Any:
@@ -44,45 +99,45 @@ class BaseService:
             raise NotImplementedError("Model must be set for BaseService subclass")
 
         try:
-            async with async_session_maker() as session:
+            async with session_scope() as session:
                 query = insert(cls.model).values(**data).returning(cls.model)
                 result = await session.execute(query)
-                await session.commit()
-                return result.scalar_one()
+                obj = result.scalar_one()
+                await cls.record_change(session, "created", obj)
+                await cls.invalidate_cache(session, obj.id)
+                return obj
         except IntegrityError as e:
-            if "prefix_name" in str(e):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Project with this prefix name already exists"
-                )
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Database integrity error"
-            )
+            raise integrity_error_to_http(e)
 
     @classmethod
     async def update_by_id(cls, object_id: int, **data) -> Optional[Any]:
         if cls.model is None:
             raise NotImplementedError("Model must be set for BaseService subclass")
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             query = (
                 update(cls.model)
                 .where(cls.model.id == object_id)
                 .values(**data)
-                .execution_options(synchronize_session="fetch")
+                .returning(cls.model)
+                .execution_options(populate_existing=True)
             )
-            await session.execute(query)
-            await session.commit()
-            return await cls.find_by_id(object_id)
+            result = await session.execute(query)
+            obj = result.scalar_one_or_none()
+            if obj is not None:
+                await cls.record_change(session, "updated", obj)
+                await cls.invalidate_cache(session, object_id)
+            return obj
 
     @classmethod
     async def delete_by_id(cls, object_id: int) -> bool:
         if cls.model is None:
             raise NotImplementedError("Model must be set for BaseService subclass")
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             obj = await session.get(cls.model, object_id)
             if obj is None:
                 return False
+            await cls.record_change(session, "deleted", obj)
+            await cls.invalidate_cache(session, object_id)
             await session.delete(obj)
-            await session.commit()
-            return True
\ No newline at end of file
+            await session.flush()
+            return True
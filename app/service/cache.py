@@ -0,0 +1,198 @@
+import json
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.service.invalidation import register_cache
+
+MISSING = object()
+
+
+class TTLCache:
+    """Ограниченный LRU-кэш внутри процесса с временем жизни записей и счётчиками попаданий."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SerializedCache:
+    """
+    Локальная замена внешнего кэша (Redis, Memcached): значения хранятся сериализованными под строковыми ключами,
+    поэтому каждый get возвращает новую копию — так же, как при настоящем out-of-process бэкенде.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._store = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        raw = self._store.get(key)
+        if raw is MISSING:
+            return default
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self._store.set(key, pickle.dumps(value))
+
+    def pop(self, key: str) -> None:
+        self._store.pop(key)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> dict:
+        return self._store.stats()
+
+
+class ModelCache:
+    """
+    Read-through кэш строк одной модели для BaseService.
+    Хранятся снимки колонок, а не ORM-объекты: каждый get собирает новый detached-объект, общих изменяемых
+    экземпляров между запросами нет. None в кэше — запомненное отсутствие строки.
+    Результаты find_one_or_none хранятся под ключом с поколением модели: любая запись увеличивает поколение,
+    и все закэшированные выборки по фильтрам перестают находиться.
+    Колонки из exclude (например, хеш пароля) не кэшируются: у восстановленного объекта они не загружены.
+    """
+
+    def __init__(self, model, backend, exclude: tuple[str, ...] = ()):
+        self.model = model
+        self.backend = backend
+        self.exclude = exclude
+        self.name = model.__tablename__
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._columns: Optional[list[str]] = None
+
+    def _generation(self) -> int:
+        key = f"{self.name}:generation"
+        generation = self.backend.get(key)
+        if generation is MISSING:
+            # Новое значение, а не 0: иначе после вытеснения ключа поколения ожили бы старые записи
+            generation = time.time_ns()
+            self.backend.set(key, generation)
+        return generation
+
+    def _id_key(self, object_id: Any) -> str:
+        return f"{self.name}:id:{object_id}"
+
+    def _query_key(self, filter_by: dict) -> str:
+        return f"{self.name}:q:{self._generation()}:{json.dumps(sorted(filter_by.items()), default=str)}"
+
+    def _snapshot(self, obj: Any) -> Any:
+        if obj is None:
+            return None
+        if self._columns is None:
+            # Маппер конфигурируется лениво, к моменту первой записи все модели уже объявлены
+            self._columns = [
+                attr.key for attr in inspect(self.model).column_attrs
+                if not attr.deferred and attr.key not in self.exclude
+            ]
+        return {key: getattr(obj, key) for key in self._columns}
+
+    def _restore(self, value: Any) -> Any:
+        if value is MISSING:
+            self.misses += 1
+            return MISSING
+        if value is None:
+            self.negative_hits += 1
+            return None
+        self.hits += 1
+        obj = self.model(**value)
+        make_transient_to_detached(obj)
+        return obj
+
+    def get_by_id(self, object_id: Any) -> Any:
+        return self._restore(self.backend.get(self._id_key(object_id)))
+
+    def set_by_id(self, object_id: Any, obj: Any) -> None:
+        self.backend.set(self._id_key(object_id), self._snapshot(obj))
+
+    def get_one(self, filter_by: dict) -> Any:
+        return self._restore(self.backend.get(self._query_key(filter_by)))
+
+    def set_one(self, filter_by: dict, obj: Any) -> None:
+        self.backend.set(self._query_key(filter_by), self._snapshot(obj))
+
+    def invalidate(self, object_id: Any) -> None:
+        self.backend.pop(self._id_key(object_id))
+        self.backend.set(f"{self.name}:generation", time.time_ns())
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self.backend),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+
+# Все кэши моделей по имени таблицы, для метрик и сброса
+model_caches: dict[str, ModelCache] = {}
+
+
+def make_model_cache(model, exclude: tuple[str, ...] = ()) -> ModelCache:
+    """Создать кэш модели на бэкенде из настроек MODEL_CACHE_*."""
+    backend_class = SerializedCache if settings.MODEL_CACHE_BACKEND == "serialized" else TTLCache
+    cache = ModelCache(
+        model, backend_class(maxsize=settings.MODEL_CACHE_SIZE, ttl=settings.MODEL_CACHE_TTL), exclude
+    )
+    model_caches[cache.name] = cache
+    register_cache(cache.name, cache.invalidate, cache.clear)
+    return cache
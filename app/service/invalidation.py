@@ -0,0 +1,52 @@
+import json
+from typing import Any, Callable, Optional
+
+from sqlalchemy import select, func
+
+from app.database import session_scope
+from app.service.pg_listener import pg_listener
+
+# Канал NOTIFY, по которому воркеры сообщают друг другу об изменённых ключах кэшей
+INVALIDATION_CHANNEL = "cache_invalidation"
+
+_evictors: dict[str, Callable[[Any], None]] = {}
+_clearers: dict[str, Callable[[], None]] = {}
+
+
+def register_cache(name: str, evict: Callable[[Any], None], clear: Callable[[], None]) -> None:
+    """Подключить кэш процесса к шине: evict(key) сбрасывает один ключ, clear() — весь кэш."""
+    _evictors[name] = evict
+    _clearers[name] = clear
+
+
+async def publish_invalidation(name: str, key: Optional[Any] = None) -> None:
+    """
+    Сообщить всем воркерам, что ключ кэша name устарел (key=None — весь кэш).
+    NOTIFY отправляется в транзакции текущей единицы работы и доставляется только после коммита.
+    """
+    payload = json.dumps({"cache": name, "key": key})
+    async with session_scope() as session:
+        await session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+
+def handle_invalidation(payload: str) -> None:
+    message = json.loads(payload)
+    name, key = message["cache"], message["key"]
+    if key is None:
+        clear = _clearers.get(name)
+        if clear is not None:
+            clear()
+        return
+    evict = _evictors.get(name)
+    if evict is not None:
+        evict(key)
+
+
+def clear_all() -> None:
+    """Пока LISTEN был оборван, уведомления терялись: кэшам процесса больше нельзя доверять."""
+    for clear in _clearers.values():
+        clear()
+
+
+pg_listener.subscribe(INVALIDATION_CHANNEL, handle_invalidation)
+pg_listener.on_reconnect(clear_all)
@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from app.exceptions import InvalidCursor
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    raise TypeError(f"Unsupported cursor value: {value!r}")
+
+
+def _decode_value(value: dict) -> Any:
+    if "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Упаковать значения ключа последней строки страницы в непрозрачный курсор."""
+    raw = json.dumps(values, default=_encode_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type | tuple[type, ...]) -> list[Any]:
+    """
+    Распаковать курсор, созданный encode_cursor; types — ожидаемые типы значений по порядку.
+    Курсор приходит от клиента, поэтому значения другого типа не доходят до запроса, а дают InvalidCursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw, object_hook=_decode_value)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor
+    for value, expected in zip(values, types):
+        # bool — подкласс int, но в курсорах логических значений не бывает
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise InvalidCursor
+    return values
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Callable, Optional
+
+import asyncpg
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PgListener:
+    """
+    Фоновое соединение asyncpg, слушающее каналы Postgres LISTEN/NOTIFY.
+    При обрыве переподключается с экспоненциальной задержкой; уведомления, пришедшие во время обрыва,
+    потеряны, поэтому после переподключения вызываются обработчики on_reconnect.
+    """
+
+    def __init__(self, dsn: str, max_reconnect_delay: float = 30.0, ping_interval: float = 30.0):
+        self.dsn = dsn
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ping_interval = ping_interval
+        self.connected = False
+        self.reconnects = 0
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._reconnect_handlers: list[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_reconnect(self, handler: Callable[[], None]) -> None:
+        self._reconnect_handlers.append(handler)
+
+    def start(self) -> None:
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _dispatch(self, _connection, _pid: int, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("LISTEN handler failed for channel %s", channel)
+
+    async def _listen(self, connection: asyncpg.Connection) -> None:
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        for channel in self._handlers:
+            await connection.add_listener(channel, self._dispatch)
+        while not closed.is_set():
+            try:
+                await asyncio.wait_for(closed.wait(), timeout=self.ping_interval)
+            except asyncio.TimeoutError:
+                # Молча оборванное TCP-соединение termination listener не заметит
+                await connection.execute("SELECT 1", timeout=self.ping_interval)
+
+    async def _run(self) -> None:
+        delay = 1.0
+        was_connected = False
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                logger.warning("LISTEN connection failed: %s", e)
+            else:
+                try:
+                    self.connected = True
+                    delay = 1.0
+                    if was_connected:
+                        self.reconnects += 1
+                        for handler in self._reconnect_handlers:
+                            handler()
+                    was_connected = True
+                    await self._listen(connection)
+                except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                    logger.warning("LISTEN connection lost: %s", e)
+                finally:
+                    self.connected = False
+                    connection.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "channels": list(self._handlers),
+        }
+
+
+# Общее LISTEN-соединение воркера, запускается в lifespan приложения
+pg_listener = PgListener(settings.asyncpg_dsn)
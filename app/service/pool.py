@@ -0,0 +1,113 @@
+import time
+from bisect import bisect_left
+
+from greenlet import getcurrent, greenlet
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Границы корзин гистограммы ожидания соединения, мс
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class _CheckoutTiming:
+    """Время одной выдачи соединения по частям: ожидание в очереди пула и открытие новых соединений."""
+
+    def __init__(self):
+        self.wait = 0.0
+        self.connect = 0.0
+        self.in_queue = False
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, который считает выдачи соединений, время их ожидания и таймауты.
+    Ожидание в очереди пула, открытие новых соединений и pre-ping учитываются раздельно,
+    чтобы нехватку соединений в пуле можно было отличить от медленной БД.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Выдачи по greenlet: ожидание в очереди переключает greenlet, и выдачи идут вперемешку
+        self._timings: dict[greenlet, _CheckoutTiming] = {}
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+        self.connects = 0
+        self.connect_total = 0.0
+        self.pre_ping_total = 0.0
+
+    def _should_wrap_creator(self, creator):
+        invoke_creator = super()._should_wrap_creator(creator)
+
+        def timed_creator(connection_record):
+            started = time.perf_counter()
+            try:
+                return invoke_creator(connection_record)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.connects += 1
+                self.connect_total += elapsed
+                timing = self._timings.get(getcurrent())
+                if timing is not None:
+                    timing.connect += elapsed
+
+        return timed_creator
+
+    def _do_get(self):
+        timing = self._timings.get(getcurrent())
+        # QueuePool._do_get вызывает себя рекурсивно: время считается только во внешнем вызове
+        if timing is None or timing.in_queue:
+            return super()._do_get()
+        timing.in_queue = True
+        started = time.perf_counter()
+        connect_before = timing.connect
+        try:
+            return super()._do_get()
+        finally:
+            timing.in_queue = False
+            timing.wait += time.perf_counter() - started - (timing.connect - connect_before)
+
+    def connect(self):
+        key = getcurrent()
+        timing = self._timings[key] = _CheckoutTiming()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            del self._timings[key]
+        # Остаток после очереди и открытия соединений — pre-ping и обработчики checkout
+        self.pre_ping_total += max(time.perf_counter() - started - timing.wait - timing.connect, 0.0)
+        self.checkouts += 1
+        self.wait_total += timing.wait
+        self.wait_max = max(self.wait_max, timing.wait)
+        self.wait_buckets[bisect_left(CHECKOUT_BUCKETS_MS, timing.wait * 1000)] += 1
+        return connection
+
+    def stats(self) -> dict:
+        labels = [f"<={bound}" for bound in CHECKOUT_BUCKETS_MS] + [f">{CHECKOUT_BUCKETS_MS[-1]}"]
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": self.overflow(),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+            "wait_ms_buckets": dict(zip(labels, self.wait_buckets)),
+            "connects": self.connects,
+            "connect_avg_ms": self.connect_total / self.connects * 1000 if self.connects else 0.0,
+            "pre_ping_avg_ms": self.pre_ping_total / self.checkouts * 1000 if self.checkouts else 0.0,
+        }
+
+
+def pool_stats(pool) -> dict:
+    """Метрики пула; для пулов без инструментирования (NullPool в тестах) — только его статус."""
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return {"status": pool.status()}
@@ -0,0 +1,83 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Число, время и формы SQL-запросов в пределах области (обычно HTTP-запроса)."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        # Вложенные области (например, бюджет в тесте вокруг HTTP-запроса) учитываются все
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration += duration
+            stats.statements[statement] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Одинаковые по форме запросы, выполненные не меньше threshold раз — признак N+1."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def report(self) -> str:
+        return "\n".join(f"{count} x {statement}" for statement, count in self.statements.most_common())
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def query_stats_scope() -> Iterator[QueryStats]:
+    stats = QueryStats(parent=_query_stats.get())
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _query_stats.get()
+    if stats is not None:
+        # Текст уже параметризован ($1, $2 ...), поэтому совпадает у запросов одной формы
+        stats.record(" ".join(statement.split()), time.perf_counter() - context._query_started_at)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def request_query_headers(method: str, path: str, stats: QueryStats) -> dict[str, str]:
+    """Записать сводку запросов HTTP-запроса в лог и вернуть заголовки ответа с ней."""
+    headers = {
+        "X-Query-Count": str(stats.count),
+        "X-Query-Time-Ms": f"{stats.duration * 1000:.1f}",
+    }
+    logger.info("%s %s: %d SQL queries in %.1f ms", method, path, stats.count, stats.duration * 1000)
+    repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        statement, count = repeated[0]
+        headers["X-Query-Repeated"] = str(count)
+        logger.warning("%s %s: possible N+1, %d x %s", method, path, count, statement[:500])
+    return headers
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from typing import Any, Optional
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Модули, кадры которых пропускаются при поиске вызвавшего запрос метода
+_INFRASTRUCTURE_MODULES = ("app.database", "app.service.query_stats", "app.service.slow_queries")
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Типы параметров без значений: в лог не попадают пароли и персональные данные."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameter_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_value_shape(value)}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(_value_shape(value) for value in parameters or ()) + ")"
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        item_type = type(value[0]).__name__ if value else "?"
+        return f"{type(value).__name__}[{item_type}]({len(value)})"
+    return type(value).__name__
+
+
+def calling_method() -> Optional[str]:
+    """
+    Ближайший метод приложения, выполнивший запрос, например ProjectService.find_by_user_id.
+    События SQLAlchemy идут в отдельном greenlet, поэтому просматриваются и приостановленные
+    кадры родительских greenlet, где находятся корутины сервисов.
+    """
+    frames = [sys._getframe(1)]
+    current = getcurrent().parent
+    while current is not None:
+        frames.append(current.gr_frame)
+        current = current.parent
+    for frame in frames:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("app.") and not module.startswith(_INFRASTRUCTURE_MODULES):
+                cls = frame.f_locals.get("cls")
+                if isinstance(cls, type):
+                    return f"{cls.__name__}.{frame.f_code.co_name}"
+                return frame.f_code.co_qualname
+            frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """
+    Журнал запросов дольше SLOW_QUERY_THRESHOLD_MS.
+    План (EXPLAIN без ANALYZE) снимается в фоне отдельным соединением, не чаще раза
+    в SLOW_QUERY_EXPLAIN_INTERVAL секунд для одной формы запроса.
+    """
+
+    def __init__(self, threshold_ms: float, explain_interval: float, keep: int = 50):
+        self.threshold_ms = threshold_ms
+        self.count = 0
+        self.recent: deque[dict] = deque(maxlen=keep)
+        self.explain_interval = explain_interval
+        self._explained_at: dict[str, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def watch(self, engine: AsyncEngine) -> None:
+        if self.threshold_ms <= 0:
+            return
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            context._slow_query_started_at = time.perf_counter()
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            duration_ms = (time.perf_counter() - context._slow_query_started_at) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.observe(engine, statement, parameters, executemany, duration_ms)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+    def observe(self, engine: AsyncEngine, statement: str, parameters: Any, executemany: bool, duration_ms: float) -> None:
+        statement = " ".join(statement.split())
+        if statement.upper().startswith("EXPLAIN"):
+            return
+        entry = {
+            "duration_ms": round(duration_ms, 1),
+            "method": calling_method(),
+            "statement": statement,
+            "parameters": parameter_shape(parameters, executemany),
+            "plan": None,
+        }
+        self.count += 1
+        self.recent.append(entry)
+        logger.warning(
+            "Slow query %.1f ms in %s: %s params=%s",
+            duration_ms, entry["method"], statement[:1000], entry["parameters"],
+        )
+        if executemany or not self._should_explain(statement):
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._explain(engine, entry, parameters))
+        except RuntimeError:
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _should_explain(self, fingerprint: str) -> bool:
+        now = time.monotonic()
+        if now - self._explained_at.get(fingerprint, float("-inf")) < self.explain_interval:
+            return False
+        if len(self._explained_at) >= 1000:
+            self._explained_at = {
+                key: at for key, at in self._explained_at.items() if now - at < self.explain_interval
+            }
+        self._explained_at[fingerprint] = now
+        return True
+
+    async def _explain(self, engine: AsyncEngine, entry: dict, parameters: Any) -> None:
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE off) {entry['statement']}", parameters)
+                entry["plan"] = "\n".join(row[0] for row in result)
+        except Exception as e:
+            logger.warning("EXPLAIN failed for slow query in %s: %s", entry["method"], e)
+            return
+        logger.warning("Plan of slow query in %s:\n%s", entry["method"], entry["plan"])
+
+    def stats(self) -> dict:
+        return {"threshold_ms": self.threshold_ms, "count": self.count, "recent": list(self.recent)}
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_EXPLAIN_INTERVAL)
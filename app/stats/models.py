@@ -0,0 +1,92 @@
+from sqlalchemy import String, Integer, ForeignKey, DDL, event
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+from app.tasks.models import TaskTableModel
+
+
+class ProjectTaskStatsTableModel(Base):
+    """Счётчики задач проекта по статусу, приоритету и исполнителю; ведутся триггерами на tasks."""
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True, comment="ID проекта"
+    )
+    dimension: Mapped[str] = mapped_column(
+        String(20), primary_key=True, comment="Разрез: status, priority или assignee"
+    )
+    value: Mapped[int] = mapped_column(Integer, primary_key=True, comment="Значение разреза")
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="Число задач")
+
+    def __str__(self):
+        return f"Stats {self.project_id}: {self.dimension}={self.value} -> {self.task_count}"
+
+
+# Изменения применяются построчно в порядке (project_id, dimension, value): строки счётчиков
+# блокируются всеми транзакциями в одном порядке, а неизменившиеся разрезы взаимно гасятся и не блокируются.
+# Уменьшения только обновляют строку: при удалении проекта его счётчики уже удалены каскадом,
+# и отложенные триггеры задач не должны создавать их заново
+STATS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION project_task_stats_apply() RETURNS trigger AS $$
+DECLARE
+    projects integer[] := '{}';
+    dimensions text[] := '{}';
+    stat_values integer[] := '{}';
+    deltas integer[] := '{}';
+    change record;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        projects := projects || ARRAY[OLD.project_id, OLD.project_id, OLD.project_id];
+        dimensions := dimensions || ARRAY['assignee', 'priority', 'status'];
+        stat_values := stat_values || ARRAY[OLD.assignee_id, OLD.priority, OLD.status];
+        deltas := deltas || ARRAY[-1, -1, -1];
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        projects := projects || ARRAY[NEW.project_id, NEW.project_id, NEW.project_id];
+        dimensions := dimensions || ARRAY['assignee', 'priority', 'status'];
+        stat_values := stat_values || ARRAY[NEW.assignee_id, NEW.priority, NEW.status];
+        deltas := deltas || ARRAY[1, 1, 1];
+    END IF;
+    FOR change IN
+        SELECT d.project_id, d.dimension, d.value, sum(d.delta) AS delta
+        FROM unnest(projects, dimensions, stat_values, deltas) AS d(project_id, dimension, value, delta)
+        GROUP BY d.project_id, d.dimension, d.value
+        HAVING sum(d.delta) <> 0
+        ORDER BY d.project_id, d.dimension, d.value
+    LOOP
+        IF change.delta < 0 THEN
+            UPDATE project_task_stats SET task_count = task_count + change.delta
+            WHERE project_id = change.project_id AND dimension = change.dimension AND value = change.value;
+        ELSE
+            INSERT INTO project_task_stats (project_id, dimension, value, task_count)
+            VALUES (change.project_id, change.dimension, change.value, change.delta)
+            ON CONFLICT (project_id, dimension, value)
+            DO UPDATE SET task_count = project_task_stats.task_count + EXCLUDED.task_count;
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+STATS_INSERT_DELETE_TRIGGER_SQL = """
+CREATE TRIGGER tasks_stats_insert_delete
+AFTER INSERT OR DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION project_task_stats_apply()
+"""
+
+# Срабатывает только когда меняется одно из учитываемых полей
+STATS_UPDATE_TRIGGER_SQL = """
+CREATE TRIGGER tasks_stats_update
+AFTER UPDATE OF project_id, status, priority, assignee_id ON tasks
+FOR EACH ROW
+WHEN (
+    (OLD.project_id, OLD.status, OLD.priority, OLD.assignee_id)
+    IS DISTINCT FROM (NEW.project_id, NEW.status, NEW.priority, NEW.assignee_id)
+)
+EXECUTE FUNCTION project_task_stats_apply()
+"""
+
+STATS_DDL = (STATS_FUNCTION_SQL, STATS_INSERT_DELETE_TRIGGER_SQL, STATS_UPDATE_TRIGGER_SQL)
+
+for statement in STATS_DDL:
+    event.listen(TaskTableModel.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.database import get_async_session
+from app.stats.schemas import SchemaProjectStats, SchemaStatsReconcile
+from app.stats.service import ProjectStatsService
+from app.users.dependencies import get_current_user
+from app.users.schemas import SchemaPrincipal
+
+router = APIRouter(prefix="/project", tags=["Stats"], dependencies=[Depends(get_async_session)])
+
+
+@router.get("/{project_id}/stats", response_model=SchemaProjectStats)
+async def get_project_stats(
+        project_id: int,
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await ProjectStatsService.get_project_stats(project_id, current_user)
+
+
+@router.post("/stats/reconcile", response_model=SchemaStatsReconcile)
+async def reconcile_project_stats(
+        project_id: Optional[int] = Query(None, description="Пересчитать только этот проект"),
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await ProjectStatsService.reconcile_by_admin(project_id, current_user)
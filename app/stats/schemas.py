@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+
+class SchemaProjectStats(BaseModel):
+    """Количество задач проекта в разных разрезах"""
+    project_id: int = Field(..., description="ID проекта")
+    total: int = Field(..., description="Всего задач")
+    by_status: dict[int, int] = Field(..., description="Статус -> число задач")
+    by_priority: dict[int, int] = Field(..., description="Приоритет -> число задач")
+    by_assignee: dict[int, int] = Field(..., description="ID исполнителя -> число задач")
+
+class SchemaStatsReconcile(BaseModel):
+    """Результат пересчёта счётчиков"""
+    corrected: int = Field(..., description="Сколько счётчиков разошлось с фактическими данными")
@@ -0,0 +1,113 @@
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, func, union_all, literal, and_, text
+
+from app.database import session_scope
+from app.exceptions import UserPermissionError
+from app.service.base import BaseService
+from app.stats.models import ProjectTaskStatsTableModel
+from app.stats.schemas import SchemaProjectStats, SchemaStatsReconcile
+from app.tasks.dependencies import check_access_for_tasks
+from app.tasks.models import TaskTableModel
+from app.users.schemas import SchemaPrincipal
+
+STATS_DIMENSIONS = {
+    "status": TaskTableModel.status,
+    "priority": TaskTableModel.priority,
+    "assignee": TaskTableModel.assignee_id,
+}
+
+
+def _actual_counts(project_id: Optional[int]):
+    """Фактические счётчики, посчитанные GROUP BY по tasks."""
+    selects = []
+    for dimension, column in STATS_DIMENSIONS.items():
+        query = select(
+            TaskTableModel.project_id.label("project_id"),
+            literal(dimension).label("dimension"),
+            column.label("value"),
+            func.count().label("task_count"),
+        ).group_by(TaskTableModel.project_id, column)
+        if project_id is not None:
+            query = query.where(TaskTableModel.project_id == project_id)
+        selects.append(query)
+    return union_all(*selects)
+
+
+class ProjectStatsService(BaseService):
+    model = ProjectTaskStatsTableModel
+
+    @classmethod
+    async def get_project_stats(cls, project_id: int, current_user: SchemaPrincipal) -> SchemaProjectStats:
+        await check_access_for_tasks(project_id, current_user)
+        async with session_scope() as session:
+            result = await session.execute(
+                select(
+                    ProjectTaskStatsTableModel.dimension,
+                    ProjectTaskStatsTableModel.value,
+                    ProjectTaskStatsTableModel.task_count,
+                ).where(
+                    ProjectTaskStatsTableModel.project_id == project_id,
+                    ProjectTaskStatsTableModel.task_count > 0,
+                )
+            )
+            rows = result.all()
+        counts = {dimension: {} for dimension in STATS_DIMENSIONS}
+        for dimension, value, task_count in rows:
+            counts[dimension][value] = task_count
+        return SchemaProjectStats(
+            project_id=project_id,
+            total=sum(counts["status"].values()),
+            by_status=counts["status"],
+            by_priority=counts["priority"],
+            by_assignee=counts["assignee"],
+        )
+
+    @classmethod
+    async def reconcile(cls, project_id: Optional[int] = None) -> SchemaStatsReconcile:
+        """
+        Пересчитать счётчики по tasks и заменить ими сохранённые.
+        На время пересчёта таблица счётчиков блокируется от записи, поэтому изменения задач ждут его окончания.
+        """
+        stats = ProjectTaskStatsTableModel
+        async with session_scope() as session:
+            await session.execute(text("LOCK TABLE project_task_stats IN SHARE ROW EXCLUSIVE MODE"))
+            actual = _actual_counts(project_id).subquery()
+            stored = select(stats)
+            if project_id is not None:
+                stored = stored.where(stats.project_id == project_id)
+            stored = stored.subquery()
+            result = await session.execute(
+                select(func.count())
+                .select_from(
+                    actual.join(
+                        stored,
+                        and_(
+                            actual.c.project_id == stored.c.project_id,
+                            actual.c.dimension == stored.c.dimension,
+                            actual.c.value == stored.c.value,
+                        ),
+                        full=True,
+                    )
+                )
+                .where(func.coalesce(actual.c.task_count, 0) != func.coalesce(stored.c.task_count, 0))
+            )
+            corrected = result.scalar_one()
+
+            if corrected:
+                query = delete(stats)
+                if project_id is not None:
+                    query = query.where(stats.project_id == project_id)
+                await session.execute(query)
+                await session.execute(
+                    insert(stats).from_select(
+                        ["project_id", "dimension", "value", "task_count"], _actual_counts(project_id)
+                    )
+                )
+        return SchemaStatsReconcile(corrected=corrected)
+
+    @classmethod
+    async def reconcile_by_admin(cls, project_id: Optional[int], current_user: SchemaPrincipal) -> SchemaStatsReconcile:
+        if not current_user.is_admin:
+            raise UserPermissionError
+        return await cls.reconcile(project_id)
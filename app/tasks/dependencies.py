@@ -1,10 +1,10 @@
 from app.projects.service import ProjectService
 from app.exceptions import UserPermissionError, UserIsNotMemberProject
-from app.users.models import UsersTableModel
+from app.users.schemas import SchemaPrincipal
 
 async def check_access_for_tasks(
     project_id,
-    current_user: UsersTableModel
+    current_user: SchemaPrincipal
 ):
     if not (current_user.is_manager or current_user.is_user):
         raise UserPermissionError
@@ -5,6 +5,11 @@ TaskNotFound = HTTPException(
     detail="Task not found",
 )
 
+TasksFromDifferentProjects = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="All tasks must belong to the same project",
+)
+
 
 class ProjectNotFound(HTTPException):
     def __init__(self):
@@ -1,10 +1,24 @@
-from sqlalchemy import String, DateTime, func, Integer, ForeignKey
+from typing import Any
+
+from sqlalchemy import String, DateTime, func, Integer, ForeignKey, UniqueConstraint, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
 
 class TaskTableModel(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        UniqueConstraint("project_id", "local_task_id", name="uq_tasks_project_id_local_task_id"),
+        Index("ix_tasks_project_id_status_local_task_id", "project_id", "status", "local_task_id"),
+        Index("ix_tasks_project_id_status_id", "project_id", "status", "id"),
+        Index("ix_tasks_project_id_assignee_id_local_task_id", "project_id", "assignee_id", "local_task_id"),
+        Index("ix_tasks_project_id_priority_id", "project_id", "priority", "id"),
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_tasks_project_id_due_date", "project_id", "due_date"),
+        Index("ix_tasks_assignee_id_status_due_date", "assignee_id", "status", "due_date"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, comment="Уникальный идентификатор задачи")
     name: Mapped[str] = mapped_column(String(100), nullable=False, comment="Название задачи")
@@ -39,6 +53,17 @@ class TaskTableModel(Base):
 
     local_task_id: Mapped[int] = mapped_column(Integer, nullable=False, comment="Номер задачи в проекте")
 
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+        comment="Полнотекстовый индекс по названию и описанию задачи",
+    )
+
     project = relationship("ProjectTableModel", back_populates="tasks")
 
     def __str__(self):
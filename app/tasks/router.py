@@ -1,44 +1,91 @@
-from fastapi import APIRouter, status, Depends
+from typing import Annotated, Literal
 
-from app.tasks.schemas import SchemaTask, SchemaTaskAdd, SchemaTaskUpdate
+from fastapi import APIRouter, status, Depends, Query, Body
+from fastapi.responses import StreamingResponse
+
+from app.database import get_async_session
+from app.tasks.schemas import (
+    SchemaTask, SchemaTaskAdd, SchemaTaskUpdate, SchemaTaskFilter, SchemaTaskPage, SchemaAssignedTaskFilter,
+    SchemaBoard
+)
 from app.tasks.service import TaskService
 from app.users.dependencies import get_current_user
-from app.users.models import UsersTableModel
+from app.users.schemas import SchemaPrincipal
 
-router = APIRouter(prefix="/tasks",tags=["Tasks"])
+router = APIRouter(prefix="/tasks", tags=["Tasks"], dependencies=[Depends(get_async_session)])
 
 
-@router.get("/{task_id}", response_model=SchemaTask)
-async def get_task_by_id(task_id:int, current_user: UsersTableModel = Depends(get_current_user)):
+@router.get("/{task_id:int}", response_model=SchemaTask)
+async def get_task_by_id(task_id:int, current_user: SchemaPrincipal = Depends(get_current_user)):
     return await TaskService.get_task_by_id(task_id, current_user)
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=SchemaTask)
-async def add_task(new_task: SchemaTaskAdd, current_user: UsersTableModel = Depends(get_current_user)):
+async def add_task(new_task: SchemaTaskAdd, current_user: SchemaPrincipal = Depends(get_current_user)):
     return await TaskService.add_task(new_task, current_user)
 
+@router.post("/bulk", status_code=status.HTTP_201_CREATED, response_model=list[SchemaTask])
+async def add_tasks_bulk(
+        new_tasks: Annotated[list[SchemaTaskAdd], Body(min_length=1, max_length=10000)],
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await TaskService.add_tasks_bulk(new_tasks, current_user)
+
 @router.patch("/{task_id}", response_model=SchemaTask)
-async def update_task(task_id: int, data: SchemaTaskUpdate, current_user: UsersTableModel = Depends(get_current_user)):
+async def update_task(task_id: int, data: SchemaTaskUpdate, current_user: SchemaPrincipal = Depends(get_current_user)):
     return await TaskService.update_task(task_id, data, current_user)
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(task_id: int, current_user: UsersTableModel = Depends(get_current_user)):
+async def delete_task(task_id: int, current_user: SchemaPrincipal = Depends(get_current_user)):
     return await TaskService.delete_task(task_id, current_user)
 
-@router.get("/tasks-by-project/{project_id}", response_model=list[SchemaTask])
-async def get_tasks_by_project(project_id: int, current_user: UsersTableModel = Depends(get_current_user)):
-    return await TaskService.get_tasks_by_project(project_id, current_user)
+@router.get("/tasks-by-project/{project_id}", response_model=SchemaTaskPage)
+async def get_tasks_by_project(
+        project_id: int,
+        filters: Annotated[SchemaTaskFilter, Query()],
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await TaskService.get_tasks_page(project_id, filters, current_user)
+
+@router.get("/board/{project_id}", response_model=SchemaBoard)
+async def get_board(
+        project_id: int,
+        limit: int = Query(20, ge=1, le=100, description="Сколько задач показать в каждой колонке"),
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await TaskService.get_board(project_id, limit, current_user)
+
+@router.get("/assigned/me", response_model=SchemaTaskPage)
+async def get_assigned_tasks(
+        filters: Annotated[SchemaAssignedTaskFilter, Query()],
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    return await TaskService.get_assigned_tasks(filters, current_user)
+
+@router.get("/export/{project_id}", response_class=StreamingResponse)
+async def export_tasks(
+        project_id: int,
+        export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+        current_user: SchemaPrincipal = Depends(get_current_user)
+):
+    rows = await TaskService.export_tasks(project_id, export_format, current_user)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        rows,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}-tasks.{export_format}"'},
+    )
 
 @router.get("/{project_prefix}-{local_task_id}", response_model=SchemaTask)
 async def get_task_by_project(
         project_prefix: str,
         local_task_id: int,
-        current_user: UsersTableModel = Depends(get_current_user)
+        current_user: SchemaPrincipal = Depends(get_current_user)
 ):
     return await TaskService.get_task_by_prefix_and_id(project_prefix, local_task_id, current_user)
 
 @router.get("/{project_prefix}", response_model=list[SchemaTask])
-async def get_tasks_by_project(
+async def get_tasks_by_project_prefix(
         project_prefix: str,
-        current_user: UsersTableModel = Depends(get_current_user)
+        current_user: SchemaPrincipal = Depends(get_current_user)
 ):
     return await TaskService.get_tasks_by_prefix(project_prefix, current_user)
\ No newline at end of file
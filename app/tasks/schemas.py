@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -26,4 +28,43 @@ class SchemaTaskUpdate(BaseModel):
     project_id: int = Field(..., description="ID проекта")
     assignee_id: int = Field(..., description="ID исполнителя")
     priority: int = Field(..., description="Приоритет", examples=[1])
-    due_date: datetime | None = Field(None, description="Дедлайн")
\ No newline at end of file
+    due_date: datetime | None = Field(None, description="Дедлайн")
+
+class SchemaTaskFilter(BaseModel):
+    """Фильтры, сортировка и курсор для постраничного списка задач"""
+    status: int | None = Field(None, description="Статус")
+    assignee_id: int | None = Field(None, description="ID исполнителя")
+    priority: int | None = Field(None, description="Приоритет")
+    due_date_from: datetime | None = Field(None, description="Дедлайн не раньше")
+    due_date_to: datetime | None = Field(None, description="Дедлайн не позже")
+    sort: Literal["local_task_id", "created_at", "priority", "status"] = Field(
+        "local_task_id", description="Поле сортировки"
+    )
+    order: Literal["asc", "desc"] = Field("asc", description="Направление сортировки")
+    limit: int = Field(50, ge=1, le=500, description="Размер страницы")
+    cursor: str | None = Field(None, description="Курсор следующей страницы из next_cursor")
+
+class SchemaAssignedTaskFilter(BaseModel):
+    """Фильтры и курсор для списка задач, назначенных текущему пользователю"""
+    status: int | None = Field(None, description="Статус")
+    due_date_from: datetime | None = Field(None, description="Дедлайн не раньше")
+    due_date_to: datetime | None = Field(None, description="Дедлайн не позже")
+    limit: int = Field(50, ge=1, le=500, description="Размер страницы")
+    cursor: str | None = Field(None, description="Курсор следующей страницы из next_cursor")
+
+class SchemaTaskPage(BaseModel):
+    items: list[SchemaTask] = Field(..., description="Задачи страницы")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы, None если страница последняя")
+
+class SchemaBoardColumn(BaseModel):
+    """Колонка доски: первые задачи одного статуса"""
+    status: int = Field(..., description="Статус", examples=[1])
+    total: int = Field(..., description="Всего задач в колонке")
+    items: list[SchemaTask] = Field(..., description="Задачи по возрастанию локального номера")
+    next_cursor: str | None = Field(
+        None, description="Курсор для /tasks/tasks-by-project/{project_id}?status=<status>, None если задач больше нет"
+    )
+
+class SchemaBoard(BaseModel):
+    project_id: int = Field(..., description="ID проекта")
+    columns: list[SchemaBoardColumn] = Field(..., description="Колонки по возрастанию статуса")
@@ -1,33 +1,85 @@
-from sqlalchemy import select
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator
 
-from app.database import async_session_maker
-from app.projects.service import ProjectService
-from app.service.base import BaseService
+from sqlalchemy import select, insert, tuple_, and_, or_, exists, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from app.changes.service import ChangeLogService
+from app.database import session_scope, async_session_maker, execute_read
+from app.events.service import EventService
+from app.projects.service import ProjectService, remember_membership
+from app.exceptions import InvalidCursor, UserPermissionError
+from app.projects.association_tables import project_users
+from app.service.base import BaseService, integrity_error_to_http
+from app.service.pagination import encode_cursor, decode_cursor
+from app.stats.models import ProjectTaskStatsTableModel
 from app.tasks.dependencies import check_access_for_tasks
-from app.tasks.exeptions import TaskNotFound, ProjectNotFound
+from app.tasks.exeptions import TaskNotFound, ProjectNotFound, TasksFromDifferentProjects
 from app.tasks.models import TaskTableModel
-from app.tasks.schemas import SchemaTaskAdd, SchemaTaskUpdate
-from app.users.models import UsersTableModel
+from app.tasks.schemas import (
+    SchemaTaskAdd, SchemaTaskUpdate, SchemaTaskFilter, SchemaTaskPage, SchemaAssignedTaskFilter,
+    SchemaTask, SchemaBoard, SchemaBoardColumn
+)
+from app.users.schemas import SchemaPrincipal
+
+
+TASK_EXPORT_FIELDS = (
+    "id", "local_task_id", "project_id", "name", "description", "status", "priority",
+    "creator_id", "assignee_id", "due_date", "created_at", "updated_at",
+)
+EXPORT_CHUNK_SIZE = 1000
+# Типы значения поля сортировки в курсоре страницы задач
+SORT_CURSOR_TYPES = {"local_task_id": int, "created_at": datetime, "priority": int, "status": int}
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _format_export_rows(rows, export_format: str) -> str:
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([[_export_value(value) for value in row] for row in rows])
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(TASK_EXPORT_FIELDS, row)), default=_export_value, ensure_ascii=False) + "\n"
+        for row in rows
+    )
 
 
 class TaskService(BaseService):
     model = TaskTableModel
 
     @classmethod
-    async def get_project_id_by_task_id(cls, task_id: int, options=None) -> int:
-        if cls.model is None:
-            raise NotImplementedError("Model must be set for BaseService subclass")
-        async with async_session_maker() as session:
-            query = select(cls.model.project_id).where(cls.model.id == task_id)
+    async def record_change(cls, session, action: str, task: TaskTableModel) -> None:
+        await ChangeLogService.record(session, task.project_id, "task", action, task.id)
+
+    @classmethod
+    async def get_project_membership(cls, task_id: int, user_id: int) -> tuple[int, bool]:
+        """Одним запросом получить проект задачи и признак участия пользователя в нём."""
+        in_project = exists().where(
+            project_users.c.project_id == TaskTableModel.project_id,
+            project_users.c.user_id == user_id,
+        )
+        async with session_scope() as session:
+            query = select(TaskTableModel.project_id, in_project).where(TaskTableModel.id == task_id)
             result = await session.execute(query)
-            project_id = result.scalar_one_or_none()
-            if project_id is None:
+            row = result.one_or_none()
+            if row is None:
                 from fastapi import HTTPException
                 raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
-            return project_id
+            project_id, is_member = row
+        remember_membership(project_id, user_id, is_member)
+        return project_id, is_member
 
     @classmethod
-    async def get_task_by_id(cls, task_id:int, current_user: UsersTableModel):
+    async def get_task_by_id(cls, task_id:int, current_user: SchemaPrincipal):
         await check_access_for_tasks(task_id, current_user)
         task = await TaskService.find_by_id(task_id)
         if not task:
@@ -35,27 +87,79 @@ class TaskService(BaseService):
         return task
 
     @classmethod
-    async def add_task(cls, new_task: SchemaTaskAdd, current_user: UsersTableModel):
+    async def add_task(cls, new_task: SchemaTaskAdd, current_user: SchemaPrincipal):
         await check_access_for_tasks(new_task.project_id, current_user)
-        project = await ProjectService.find_project_by_id(new_task.project_id)
-        if not project:
-            raise ProjectNotFound
-        new_task_dict = new_task.model_dump()
-        local_task_id = await ProjectService.get_last_task_id(project.id)
-        new_task = await TaskService.add(**new_task_dict, creator_id=current_user.id, status=1, local_task_id=local_task_id)
-        await ProjectService.increment_last_task_id(project_id=project.id)
-        return new_task
+        try:
+            async with session_scope() as session:
+                local_task_id = await ProjectService.reserve_local_task_ids(new_task.project_id, session)
+                result = await session.execute(
+                    insert(TaskTableModel)
+                    .values(**new_task.model_dump(), creator_id=current_user.id, status=1, local_task_id=local_task_id)
+                    .returning(TaskTableModel)
+                )
+                task = result.scalar_one()
+                await cls.record_change(session, "created", task)
+                await EventService.publish(task.project_id, "task", "created", task.id)
+                return task
+        except IntegrityError as e:
+            raise integrity_error_to_http(e)
 
     @classmethod
-    async def update_task(cls, task_id: int, data: SchemaTaskUpdate, current_user: UsersTableModel):
-        task = await TaskService.update_by_id(task_id, **data.model_dump())
-        if not task:
-            raise TaskNotFound
-        await check_access_for_tasks(task.project_id, current_user)
-        return task
+    async def add_tasks_bulk(cls, new_tasks: list[SchemaTaskAdd], current_user: SchemaPrincipal):
+        """
+        Создать пачку задач одного проекта: одна проверка доступа, один сдвиг last_task_id
+        на всю пачку и вставка многострочными INSERT ... RETURNING.
+        """
+        project_ids = {task.project_id for task in new_tasks}
+        if len(project_ids) != 1:
+            raise TasksFromDifferentProjects
+        project_id = project_ids.pop()
+        await check_access_for_tasks(project_id, current_user)
+        try:
+            async with session_scope() as session:
+                first_local_task_id = await ProjectService.reserve_local_task_ids(
+                    project_id, session, count=len(new_tasks)
+                )
+                rows = [
+                    {**task.model_dump(), "creator_id": current_user.id, "status": 1, "local_task_id": first_local_task_id + i}
+                    for i, task in enumerate(new_tasks)
+                ]
+                result = await session.scalars(
+                    insert(TaskTableModel).returning(TaskTableModel, sort_by_parameter_order=True), rows
+                )
+                tasks = result.all()
+                await ChangeLogService.record_many(session, project_id, "task", "created", [task.id for task in tasks])
+                # Одно событие на пачку: NOTIFY на каждую задачу переполнил бы буферы подписчиков
+                await EventService.publish(project_id, "task", "bulk_created", None, count=len(tasks))
+                return tasks
+        except IntegrityError as e:
+            raise integrity_error_to_http(e)
+
+    @classmethod
+    async def update_task(cls, task_id: int, data: SchemaTaskUpdate, current_user: SchemaPrincipal):
+        values = data.model_dump()
+        async with session_scope() as session:
+            result = await session.execute(
+                select(TaskTableModel.project_id).where(TaskTableModel.id == task_id).with_for_update()
+            )
+            old_project_id = result.scalar_one_or_none()
+            if old_project_id is None:
+                raise TaskNotFound
+            await check_access_for_tasks(old_project_id, current_user)
+            if values["project_id"] != old_project_id:
+                await check_access_for_tasks(values["project_id"], current_user)
+                # Номер задачи уникален в проекте: в новом проекте задача получает следующий свободный
+                values["local_task_id"] = await ProjectService.reserve_local_task_ids(values["project_id"], session)
+            task = await TaskService.update_by_id(task_id, **values)
+            if task.project_id != old_project_id:
+                # Для клиентов старого проекта перенос выглядит как удаление
+                await ChangeLogService.record(session, old_project_id, "task", "deleted", task.id)
+                await EventService.publish(old_project_id, "task", "deleted", task.id)
+            await EventService.publish(task.project_id, "task", "updated", task.id)
+            return task
 
     @classmethod
-    async def delete_task(cls, task_id: int, current_user: UsersTableModel):
+    async def delete_task(cls, task_id: int, current_user: SchemaPrincipal):
         task = await TaskService.find_by_id(task_id)
         if not task:
             raise TaskNotFound
@@ -63,10 +167,11 @@ class TaskService(BaseService):
         result = await TaskService.delete_by_id(task_id)
         if not result:
             raise TaskNotFound
+        await EventService.publish(task.project_id, "task", "deleted", task_id)
         return None
 
     @classmethod
-    async def get_tasks_by_project(cls, project_id: int, current_user: UsersTableModel):
+    async def get_tasks_by_project(cls, project_id: int, current_user: SchemaPrincipal):
         await check_access_for_tasks(project_id, current_user)
         project = await ProjectService.find_project_by_id(project_id)
         if not project:
@@ -74,7 +179,159 @@ class TaskService(BaseService):
         return await TaskService.find_all(project_id=project_id)
 
     @classmethod
-    async def get_task_by_prefix_and_id(cls, project_prefix: str, local_task_id: int, current_user: UsersTableModel):
+    async def get_tasks_page(cls, project_id: int, filters: SchemaTaskFilter, current_user: SchemaPrincipal):
+        """Страница задач проекта с keyset-пагинацией по (поле сортировки, id)."""
+        await check_access_for_tasks(project_id, current_user)
+        sort_column = getattr(TaskTableModel, filters.sort)
+        query = select(TaskTableModel).where(TaskTableModel.project_id == project_id)
+        if filters.status is not None:
+            query = query.where(TaskTableModel.status == filters.status)
+        if filters.assignee_id is not None:
+            query = query.where(TaskTableModel.assignee_id == filters.assignee_id)
+        if filters.priority is not None:
+            query = query.where(TaskTableModel.priority == filters.priority)
+        if filters.due_date_from is not None:
+            query = query.where(TaskTableModel.due_date >= filters.due_date_from)
+        if filters.due_date_to is not None:
+            query = query.where(TaskTableModel.due_date <= filters.due_date_to)
+
+        if filters.cursor:
+            sort, order, last_value, last_id = decode_cursor(
+                filters.cursor, str, str, SORT_CURSOR_TYPES[filters.sort], int
+            )
+            if (sort, order) != (filters.sort, filters.order):
+                raise InvalidCursor
+            key = tuple_(sort_column, TaskTableModel.id)
+            last_key = tuple_(last_value, last_id)
+            query = query.where(key > last_key if filters.order == "asc" else key < last_key)
+
+        if filters.order == "asc":
+            query = query.order_by(sort_column.asc(), TaskTableModel.id.asc())
+        else:
+            query = query.order_by(sort_column.desc(), TaskTableModel.id.desc())
+
+        result = await execute_read(query.limit(filters.limit + 1))
+        tasks = result.scalars().all()
+
+        next_cursor = None
+        if len(tasks) > filters.limit:
+            tasks = tasks[:filters.limit]
+            last = tasks[-1]
+            next_cursor = encode_cursor(filters.sort, filters.order, getattr(last, filters.sort), last.id)
+        return SchemaTaskPage(items=tasks, next_cursor=next_cursor)
+
+    @classmethod
+    async def get_board(cls, project_id: int, limit: int, current_user: SchemaPrincipal) -> SchemaBoard:
+        """
+        Доска проекта одним запросом: колонки и их размеры берутся из счётчиков project_task_stats,
+        первые limit задач каждой колонки — через LATERAL по индексу (project_id, status, local_task_id).
+        Курсоры колонок совместимы с get_tasks_page при сортировке по умолчанию.
+        """
+        await check_access_for_tasks(project_id, current_user)
+        stats = ProjectTaskStatsTableModel
+        column_tasks = (
+            select(*[column for column in TaskTableModel.__table__.c if column.name != "search_vector"])
+            .where(TaskTableModel.project_id == stats.project_id, TaskTableModel.status == stats.value)
+            .order_by(TaskTableModel.local_task_id, TaskTableModel.id)
+            .limit(limit + 1)
+            .lateral("column_tasks")
+        )
+        task = aliased(TaskTableModel, column_tasks)
+        query = (
+            select(stats.value, stats.task_count, task)
+            .outerjoin(column_tasks, true())
+            .where(stats.project_id == project_id, stats.dimension == "status", stats.task_count > 0)
+            .order_by(stats.value, column_tasks.c.local_task_id, column_tasks.c.id)
+        )
+        result = await execute_read(query)
+        rows = result.all()
+
+        columns: dict[int, SchemaBoardColumn] = {}
+        for status, total, column_task in rows:
+            column = columns.setdefault(status, SchemaBoardColumn(status=status, total=total, items=[]))
+            if column_task is None:
+                continue
+            if len(column.items) < limit:
+                column.items.append(SchemaTask.model_validate(column_task))
+            else:
+                last = column.items[-1]
+                column.next_cursor = encode_cursor("local_task_id", "asc", last.local_task_id, last.id)
+        return SchemaBoard(project_id=project_id, columns=list(columns.values()))
+
+    @classmethod
+    async def get_assigned_tasks(cls, filters: SchemaAssignedTaskFilter, current_user: SchemaPrincipal):
+        """
+        Задачи, назначенные пользователю, во всех его проектах одним запросом.
+        Порядок — по дедлайну (задачи без дедлайна в конце), затем по id.
+        """
+        if not (current_user.is_manager or current_user.is_user):
+            raise UserPermissionError
+        query = (
+            select(TaskTableModel)
+            .join(
+                project_users,
+                and_(
+                    project_users.c.project_id == TaskTableModel.project_id,
+                    project_users.c.user_id == current_user.id,
+                ),
+            )
+            .where(TaskTableModel.assignee_id == current_user.id)
+        )
+        if filters.status is not None:
+            query = query.where(TaskTableModel.status == filters.status)
+        if filters.due_date_from is not None:
+            query = query.where(TaskTableModel.due_date >= filters.due_date_from)
+        if filters.due_date_to is not None:
+            query = query.where(TaskTableModel.due_date <= filters.due_date_to)
+
+        if filters.cursor:
+            last_due_date, last_id = decode_cursor(filters.cursor, (datetime, type(None)), int)
+            if last_due_date is None:
+                query = query.where(TaskTableModel.due_date.is_(None), TaskTableModel.id > last_id)
+            else:
+                query = query.where(
+                    or_(
+                        TaskTableModel.due_date > last_due_date,
+                        and_(TaskTableModel.due_date == last_due_date, TaskTableModel.id > last_id),
+                        TaskTableModel.due_date.is_(None),
+                    )
+                )
+        query = query.order_by(TaskTableModel.due_date.asc().nulls_last(), TaskTableModel.id.asc())
+
+        result = await execute_read(query.limit(filters.limit + 1))
+        tasks = result.scalars().all()
+
+        next_cursor = None
+        if len(tasks) > filters.limit:
+            tasks = tasks[:filters.limit]
+            next_cursor = encode_cursor(tasks[-1].due_date, tasks[-1].id)
+        return SchemaTaskPage(items=tasks, next_cursor=next_cursor)
+
+    @classmethod
+    async def export_tasks(cls, project_id: int, export_format: str, current_user: SchemaPrincipal) -> AsyncIterator[str]:
+        """Проверить доступ и вернуть поток строк выгрузки задач проекта (NDJSON или CSV)."""
+        await check_access_for_tasks(project_id, current_user)
+        return cls._iter_export(project_id, export_format)
+
+    @classmethod
+    async def _iter_export(cls, project_id: int, export_format: str) -> AsyncIterator[str]:
+        # Поток читается уже после завершения запроса, поэтому у него своя сессия,
+        # а строки идут из серверного курсора порциями по EXPORT_CHUNK_SIZE.
+        query = (
+            select(*(getattr(TaskTableModel, field) for field in TASK_EXPORT_FIELDS))
+            .where(TaskTableModel.project_id == project_id)
+            .order_by(TaskTableModel.local_task_id)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        if export_format == "csv":
+            yield _format_export_rows([TASK_EXPORT_FIELDS], export_format)
+        async with async_session_maker() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                yield _format_export_rows(rows, export_format)
+
+    @classmethod
+    async def get_task_by_prefix_and_id(cls, project_prefix: str, local_task_id: int, current_user: SchemaPrincipal):
         project_id = await ProjectService.get_project_id_by_prefix(project_prefix=project_prefix)
         task = await TaskService.find_one_or_none(local_task_id=local_task_id, project_id=project_id)
         if not task:
@@ -83,7 +340,7 @@ class TaskService(BaseService):
         return task
 
     @classmethod
-    async def get_tasks_by_prefix(cls, project_prefix: str, current_user: UsersTableModel):
+    async def get_tasks_by_prefix(cls, project_prefix: str, current_user: SchemaPrincipal):
         project_id = await ProjectService.get_project_id_by_prefix(project_prefix=project_prefix)
         tasks = await TaskService.get_tasks_by_project(project_id=project_id, current_user=current_user)
         if not tasks:
@@ -7,7 +7,8 @@ import asyncio
 import json
 
 import pytest
-from sqlalchemy import insert
+from sqlalchemy import insert, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.database import Base, async_session_maker, engine
 from app.config import settings
@@ -16,6 +17,8 @@ from app.projects.models import ProjectTableModel
 from app.tasks.models import TaskTableModel
 from app.users.models import UsersTableModel
 from app.comments.models import CommentTableModel
+from app.projects.association_tables import project_users
+from app.users.service import UsersService
 
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
@@ -93,3 +96,35 @@ async def authenticated_user():
         assert "task_manager_access_token" in ac.cookies, f"Cookies: {ac.cookies} Response: {response.text}"
         yield ac
 
+
+@pytest.fixture(scope="function")
+async def project_member():
+    """
+    add(project_id, user_id) добавляет пользователя в проект и возвращает его.
+    После теста удаляются только добавленные фикстурой членства.
+    """
+    added = []
+
+    async def add(project_id: int, user_id: int) -> UsersTableModel:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                pg_insert(project_users)
+                .values(project_id=project_id, user_id=user_id)
+                .on_conflict_do_nothing()
+                .returning(project_users.c.project_id)
+            )
+            if result.first() is not None:
+                added.append((project_id, user_id))
+            await session.commit()
+        return await UsersService.find_by_id(user_id)
+
+    yield add
+
+    async with async_session_maker() as session:
+        for project_id, user_id in added:
+            await session.execute(
+                delete(project_users).where(
+                    project_users.c.project_id == project_id, project_users.c.user_id == user_id
+                )
+            )
+        await session.commit()
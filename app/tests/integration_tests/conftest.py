@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+
+import pytest
+
+from app.service.query_stats import query_stats_scope
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Бюджет SQL-запросов на участок теста:
+
+        with query_budget(3):
+            await client.get("/tasks/board/1")
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        with query_stats_scope() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Expected at most {max_queries} SQL queries, got {stats.count}:\n{stats.report()}"
+        )
+    return budget
@@ -0,0 +1,17 @@
+from httpx import AsyncClient
+
+
+async def test_board_query_budget(authenticated_manager: AsyncClient, query_budget):
+    await authenticated_manager.post("/project/1/users/2")
+
+    with query_budget(4):
+        response = await authenticated_manager.get("/tasks/board/1")
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= 4
+
+
+async def test_assigned_tasks_query_budget(authenticated_manager: AsyncClient, query_budget):
+    with query_budget(3):
+        response = await authenticated_manager.get("/tasks/assigned/me")
+    assert response.status_code == 200
+    assert "X-Query-Repeated" not in response.headers
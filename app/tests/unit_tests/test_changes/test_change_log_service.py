@@ -0,0 +1,53 @@
+from app.changes.service import ChangeLogService
+from app.comments.service import CommentService
+from app.tasks.schemas import SchemaTaskAdd, SchemaTaskUpdate
+from app.tasks.service import TaskService
+
+
+async def current_cursor(project_id: int, user):
+    changes = await ChangeLogService.get_changes(project_id, None, 5000, user)
+    while changes.has_more:
+        changes = await ChangeLogService.get_changes(project_id, changes.next_cursor, 5000, user)
+    return changes.next_cursor
+
+
+async def test_changes_since_cursor(project_member):
+    user = await project_member(project_id=2, user_id=2)
+    since = await current_cursor(2, user)
+
+    task = await TaskService.add(
+        name="sync", project_id=2, creator_id=2, assignee_id=2, priority=1, status=1, local_task_id=1000
+    )
+    await TaskService.update_by_id(task.id, name="sync updated")
+    kept = await CommentService.add(creator_id=2, comment_text="sync kept", task_id=task.id)
+    removed = await CommentService.add(creator_id=2, comment_text="sync removed", task_id=task.id)
+    await CommentService.delete_by_id(removed.id)
+
+    changes = await ChangeLogService.get_changes(2, since, 1000, user)
+    assert [t.name for t in changes.tasks] == ["sync updated"]
+    assert [c.id for c in changes.comments] == [kept.id]
+    assert [(d.entity, d.id) for d in changes.deleted] == [("comment", removed.id)]
+    assert changes.has_more is False
+
+    await TaskService.delete_by_id(task.id)
+    changes = await ChangeLogService.get_changes(2, changes.next_cursor, 1000, user)
+    assert changes.tasks == []
+    assert [(d.entity, d.id) for d in changes.deleted] == [("task", task.id)]
+
+
+async def test_moved_task_leaves_tombstone_in_old_project(project_member):
+    await project_member(project_id=1, user_id=2)
+    user = await project_member(project_id=2, user_id=2)
+    task = await TaskService.add_task(SchemaTaskAdd(name="move", project_id=1, assignee_id=2, priority=1), user)
+    old_since = await current_cursor(1, user)
+    new_since = await current_cursor(2, user)
+
+    await TaskService.update_task(task.id, SchemaTaskUpdate(name="move", project_id=2, assignee_id=2, priority=1), user)
+
+    old_changes = await ChangeLogService.get_changes(1, old_since, 1000, user)
+    assert old_changes.tasks == []
+    assert [(d.entity, d.id) for d in old_changes.deleted] == [("task", task.id)]
+    new_changes = await ChangeLogService.get_changes(2, new_since, 1000, user)
+    assert [t.id for t in new_changes.tasks] == [task.id]
+
+    await TaskService.delete_by_id(task.id)
@@ -1,6 +1,8 @@
 import pytest
+from fastapi import HTTPException
 
 from app.comments.service import CommentService
+from app.users.service import UsersService
 
 @pytest.mark.parametrize("comment_id, creator_id, comment_text, task_id",[
     (1, 2, "string1", 1),
@@ -119,4 +121,66 @@ async def test_full_lifecycle():
     deleted = await CommentService.delete_by_id(object_id=comment_id)
     assert deleted is True
 
-    assert await CommentService.find_by_id(comment_id) is None
\ No newline at end of file
+    assert await CommentService.find_by_id(comment_id) is None
+
+async def test_find_with_membership():
+    comment = await CommentService.add(creator_id=2, comment_text="membership", task_id=2)
+
+    found, project_id, in_project = await CommentService.find_with_membership(comment.id, user_id=9999)
+    assert found.id == comment.id
+    assert project_id == 1
+    assert in_project is False
+
+    await CommentService.delete_by_id(comment.id)
+
+
+async def test_find_with_membership_not_found():
+    found, project_id, in_project = await CommentService.find_with_membership(99999, user_id=2)
+    assert found is None
+    assert project_id is None
+    assert in_project is False
+
+
+async def test_comments_timeline_pages(project_member):
+    user = await project_member(project_id=2, user_id=2)
+    created = [
+        await CommentService.add(creator_id=2, comment_text=f"timeline{i}", task_id=3) for i in range(5)
+    ]
+    await CommentService.update_by_id(object_id=created[1].id, is_deleted=True)
+
+    ids, cursor = [], None
+    while True:
+        page = await CommentService.get_comments_by_task_id(3, limit=2, cursor=cursor, current_user=user)
+        assert len(page.items) <= 2
+        ids.extend(comment.id for comment in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = [comment.id for comment in created if comment.id != created[1].id]
+    assert [comment_id for comment_id in ids if comment_id in expected] == expected
+    assert created[1].id not in ids
+
+    for comment in created:
+        await CommentService.delete_by_id(comment.id)
+
+
+async def test_latest_comments_by_task_ids(project_member):
+    await project_member(project_id=1, user_id=2)
+    user = await project_member(project_id=2, user_id=2)
+    newest = await CommentService.add(creator_id=2, comment_text="latest", task_id=1)
+
+    result = await CommentService.get_latest_comments_by_task_ids([1, 3, 1], limit=2, current_user=user)
+    assert [item.task_id for item in result] == [1, 3]
+    assert len(result[0].comments) == 2
+    assert result[0].comments[0].id == newest.id
+    assert all(not comment.is_deleted for item in result for comment in item.comments)
+
+    await CommentService.delete_by_id(newest.id)
+
+
+async def test_latest_comments_unknown_task():
+    user = await UsersService.find_by_id(2)
+    with pytest.raises(HTTPException) as exc:
+        await CommentService.get_latest_comments_by_task_ids([1, 99999], limit=2, current_user=user)
+    assert exc.value.status_code == 404
@@ -0,0 +1,39 @@
+from app.events.broker import EventBroker, RESYNC_EVENT
+
+
+def make_event(project_id: int, action: str, entity_id: int) -> dict:
+    return {"type": "change", "project_id": project_id, "entity": "task", "action": action, "id": entity_id}
+
+
+async def test_events_are_coalesced_per_entity():
+    broker = EventBroker(max_pending=10)
+    with broker.subscribe(1) as subscription:
+        broker.publish(make_event(1, "created", 5))
+        broker.publish(make_event(1, "updated", 5))
+        broker.publish(make_event(1, "updated", 6))
+        broker.publish(make_event(2, "updated", 7))
+
+        events = await subscription.get(timeout=1)
+        assert [(event["id"], event["action"]) for event in events] == [(5, "created"), (6, "updated")]
+        assert await subscription.get(timeout=0.01) == []
+    assert broker.stats()["subscribers"] == 0
+
+
+async def test_overflow_turns_into_resync():
+    broker = EventBroker(max_pending=2)
+    with broker.subscribe(1) as subscription:
+        for entity_id in range(5):
+            broker.publish(make_event(1, "updated", entity_id))
+        assert await subscription.get(timeout=1) == [RESYNC_EVENT]
+
+        broker.publish(make_event(1, "deleted", 1))
+        events = await subscription.get(timeout=1)
+        assert events[0]["action"] == "deleted"
+
+
+async def test_resync_all_after_reconnect():
+    broker = EventBroker(max_pending=10)
+    with broker.subscribe(1) as first, broker.subscribe(2) as second:
+        broker.resync_all()
+        assert await first.get(timeout=1) == [RESYNC_EVENT]
+        assert await second.get(timeout=1) == [RESYNC_EVENT]
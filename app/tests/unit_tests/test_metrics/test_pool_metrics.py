@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.service.pool import InstrumentedPool
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+async def test_pool_counts_checkouts_and_timeouts():
+    pool = InstrumentedPool(creator=FakeConnection, pool_size=1, max_overflow=0, timeout=0.01)
+
+    def scenario():
+        first = pool.connect()
+        with pytest.raises(PoolTimeoutError):
+            pool.connect()
+        first.close()
+        pool.connect().close()
+
+    await greenlet_spawn(scenario)
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["checked_out"] == 0
+    assert sum(stats["wait_ms_buckets"].values()) == 2
+
+
+def slow_connection():
+    time.sleep(0.05)
+    return FakeConnection()
+
+
+async def test_pool_wait_excludes_connect_time():
+    pool = InstrumentedPool(creator=slow_connection, pool_size=1, max_overflow=0, timeout=1)
+
+    def scenario():
+        pool.connect().close()
+        pool.connect().close()
+
+    await greenlet_spawn(scenario)
+    stats = pool.stats()
+    assert stats["connects"] == 1
+    assert stats["connect_avg_ms"] >= 50
+    assert stats["wait_max_ms"] < 50
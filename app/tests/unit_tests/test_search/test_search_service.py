@@ -0,0 +1,21 @@
+from app.comments.service import CommentService
+from app.search.service import SearchService
+from app.tasks.service import TaskService
+
+
+async def test_search_tasks_and_comments(project_member):
+    manager = await project_member(project_id=2, user_id=2)
+    task = await TaskService.add(name="Searchable zebra", description="zebra zebra", project_id=2, creator_id=2,
+                                 assignee_id=2, priority=1, status=1, local_task_id=900)
+    comment = await CommentService.add(creator_id=2, comment_text="zebra spotted", task_id=task.id)
+
+    page = await SearchService.search("zebra", None, 1, None, manager)
+    assert len(page.items) == 1
+    assert page.next_cursor is not None
+    next_page = await SearchService.search("zebra", None, 1, page.next_cursor, manager)
+
+    hits = {(hit.kind, hit.id) for hit in page.items + next_page.items}
+    assert hits == {("task", task.id), ("comment", comment.id)}
+    assert page.items[0].rank >= next_page.items[0].rank
+
+    await TaskService.delete_by_id(task.id)
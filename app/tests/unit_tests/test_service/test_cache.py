@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import inspect
+
+from app.projects.models import ProjectTableModel
+from app.service.cache import TTLCache, SerializedCache, ModelCache, MISSING
+from app.users.models import UsersTableModel
+
+
+def test_cache_hit_and_miss():
+    cache = TTLCache(maxsize=2, ttl=60)
+    assert cache.get(1) is MISSING
+    cache.set(1, "one")
+    assert cache.get(1) == "one"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "one")
+    cache.set(2, "two")
+    cache.get(1)
+    cache.set(3, "three")
+    assert cache.get(2) is MISSING
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+
+
+def test_cache_expired_entry():
+    cache = TTLCache(maxsize=2, ttl=-1)
+    cache.set(1, "one")
+    assert cache.get(1) is MISSING
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("backend_class", [TTLCache, SerializedCache])
+def test_model_cache_returns_detached_copies(backend_class):
+    cache = ModelCache(ProjectTableModel, backend_class(maxsize=10, ttl=60))
+    project = ProjectTableModel(id=1, name="cached", prefix_name="CCH", description="d", creator_id=1)
+    cache.set_by_id(1, project)
+
+    restored = cache.get_by_id(1)
+    assert restored is not project
+    assert restored.name == "cached"
+    assert inspect(restored).detached
+
+    cache.set_one({"prefix_name": "NOPE"}, None)
+    assert cache.get_one({"prefix_name": "NOPE"}) is None
+    assert cache.stats()["negative_hits"] == 1
+
+
+def test_model_cache_invalidate_drops_id_and_queries():
+    cache = ModelCache(ProjectTableModel, TTLCache(maxsize=10, ttl=60))
+    project = ProjectTableModel(id=1, name="cached", prefix_name="CCH", description="d", creator_id=1)
+    cache.set_by_id(1, project)
+    cache.set_one({"prefix_name": "CCH"}, project)
+
+    cache.invalidate(1)
+    assert cache.get_by_id(1) is MISSING
+    assert cache.get_one({"prefix_name": "CCH"}) is MISSING
+
+
+def test_model_cache_skips_excluded_columns():
+    cache = ModelCache(UsersTableModel, SerializedCache(maxsize=10, ttl=60), exclude=("hash_password",))
+    user = UsersTableModel(id=1, email="e@example.com", name="n", surname="s", patronymic="p",
+                           username="cached", hash_password="secret-hash")
+    cache.set_by_id(1, user)
+
+    restored = cache.get_by_id(1)
+    assert restored.username == "cached"
+    assert "hash_password" in inspect(restored).unloaded
@@ -0,0 +1,30 @@
+import json
+
+from app.service.cache import TTLCache, MISSING
+from app.service.invalidation import register_cache, handle_invalidation, clear_all
+
+
+def test_notification_evicts_key():
+    cache = TTLCache(maxsize=10, ttl=60)
+    register_cache("test_bus", cache.pop, cache.clear)
+    cache.set(1, "one")
+    cache.set(2, "two")
+
+    handle_invalidation(json.dumps({"cache": "test_bus", "key": 1}))
+    assert cache.get(1) is MISSING
+    assert cache.get(2) == "two"
+
+    handle_invalidation(json.dumps({"cache": "test_bus", "key": None}))
+    assert len(cache) == 0
+
+
+def test_unknown_cache_is_ignored():
+    handle_invalidation(json.dumps({"cache": "not_registered", "key": 1}))
+
+
+def test_reconnect_clears_registered_caches():
+    cache = TTLCache(maxsize=10, ttl=60)
+    register_cache("test_bus_reconnect", cache.pop, cache.clear)
+    cache.set(1, "one")
+    clear_all()
+    assert len(cache) == 0
@@ -0,0 +1,24 @@
+import base64
+import json
+from datetime import datetime, UTC
+
+import pytest
+from fastapi import HTTPException
+
+from app.service.pagination import encode_cursor, decode_cursor
+
+
+def raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2030, 1, 1, tzinfo=UTC)
+    assert decode_cursor(encode_cursor(created_at, 7), datetime, int) == [created_at, 7]
+
+
+@pytest.mark.parametrize("values", [["x", {"a": 1}], [True, 1], [1], "not a list"])
+def test_mistyped_cursor_rejected(values):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(raw_cursor(values), int, int)
+    assert exc.value.status_code == 400
@@ -0,0 +1,21 @@
+from app.service.query_stats import QueryStats, query_stats_scope, request_query_headers
+
+
+def test_nested_scopes_count_into_parents():
+    with query_stats_scope() as outer:
+        with query_stats_scope() as inner:
+            inner.record("SELECT 1", 0.002)
+        outer.record("SELECT 2", 0.001)
+    assert inner.count == 1
+    assert outer.count == 2
+
+
+def test_repeated_statements_are_reported():
+    stats = QueryStats()
+    for _ in range(6):
+        stats.record("SELECT users.id FROM users WHERE users.id = $1", 0.001)
+    stats.record("SELECT 1", 0.001)
+
+    headers = request_query_headers("GET", "/tasks/1", stats)
+    assert headers["X-Query-Count"] == "7"
+    assert headers["X-Query-Repeated"] == "6"
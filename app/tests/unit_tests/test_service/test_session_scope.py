@@ -0,0 +1,23 @@
+import pytest
+
+from app.comments.service import CommentService
+from app.database import session_scope
+
+
+async def test_session_scope_shares_session():
+    async with session_scope() as session:
+        comment = await CommentService.add(creator_id=2, comment_text="unit of work", task_id=2)
+        found = await CommentService.find_by_id(comment.id)
+        assert found is comment
+        assert found in session
+
+    assert await CommentService.delete_by_id(comment.id) is True
+
+
+async def test_session_scope_rolls_back_on_error():
+    with pytest.raises(RuntimeError):
+        async with session_scope():
+            comment = await CommentService.add(creator_id=2, comment_text="rolled back", task_id=2)
+            raise RuntimeError
+
+    assert await CommentService.find_by_id(comment.id) is None
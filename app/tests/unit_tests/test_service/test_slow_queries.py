@@ -0,0 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from app.projects import service as projects_service
+from app.projects.service import ProjectService
+from app.service.slow_queries import SlowQueryLog, calling_method, parameter_shape
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape((1, "secret", [1, 2, 3])) == "(int, str, list[int](3))"
+    assert parameter_shape({"id": 1}) == "{id: int}"
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+
+
+async def test_calling_method_names_service_class(monkeypatch):
+    callers = []
+
+    class Session:
+        async def execute(self, statement):
+            callers.append(calling_method())
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=list))
+
+    @asynccontextmanager
+    async def session_scope():
+        yield Session()
+
+    monkeypatch.setattr(projects_service, "session_scope", session_scope)
+    assert await ProjectService.find_by_user_id(1) == []
+    assert callers == ["ProjectService.find_by_user_id"]
+
+
+def test_explain_is_rate_limited_per_statement():
+    explained = []
+    log = SlowQueryLog(threshold_ms=100, explain_interval=300)
+
+    async def explain(engine, entry, parameters):
+        explained.append(entry["statement"])
+
+    log._explain = explain
+
+    async def run():
+        for _ in range(3):
+            log.observe(None, "SELECT * FROM tasks WHERE id = $1", (1,), False, 150.0)
+        log.observe(None, "SELECT * FROM projects WHERE id = $1", (1,), False, 150.0)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert log.count == 4
+    assert explained == ["SELECT * FROM tasks WHERE id = $1", "SELECT * FROM projects WHERE id = $1"]
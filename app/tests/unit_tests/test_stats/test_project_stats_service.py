@@ -0,0 +1,54 @@
+from sqlalchemy import select, text, update
+
+from app.database import async_session_maker
+from app.stats.models import ProjectTaskStatsTableModel
+from app.projects.service import ProjectService
+from app.stats.service import ProjectStatsService
+from app.tasks.service import TaskService
+
+
+async def test_stats_follow_task_changes(project_member):
+    user = await project_member(project_id=2, user_id=2)
+    before = await ProjectStatsService.get_project_stats(2, user)
+
+    task = await TaskService.add(
+        name="stats", project_id=2, creator_id=2, assignee_id=2, priority=7, status=1, local_task_id=2000
+    )
+    await TaskService.update_by_id(task.id, status=3)
+    stats = await ProjectStatsService.get_project_stats(2, user)
+    assert stats.total == before.total + 1
+    assert stats.by_priority[7] == before.by_priority.get(7, 0) + 1
+    assert stats.by_status[3] == before.by_status.get(3, 0) + 1
+
+    await TaskService.delete_by_id(task.id)
+    stats = await ProjectStatsService.get_project_stats(2, user)
+    assert stats == before
+
+
+async def test_reconcile_fixes_drift():
+    async with async_session_maker() as session:
+        await session.execute(
+            update(ProjectTaskStatsTableModel)
+            .where(ProjectTaskStatsTableModel.project_id == 1, ProjectTaskStatsTableModel.dimension == "status")
+            .values(task_count=ProjectTaskStatsTableModel.task_count + 5)
+        )
+        await session.commit()
+
+    result = await ProjectStatsService.reconcile(project_id=1)
+    assert result.corrected > 0
+    assert (await ProjectStatsService.reconcile(project_id=1)).corrected == 0
+
+
+async def test_raw_project_delete_drops_stats():
+    project = await ProjectService.add(name="Stats", prefix_name="STD", description="Stats", creator_id=2)
+    await TaskService.add(
+        name="stats", project_id=project.id, creator_id=2, assignee_id=2, priority=1, status=1, local_task_id=1
+    )
+
+    async with async_session_maker() as session:
+        await session.execute(text("DELETE FROM projects WHERE id = :id"), {"id": project.id})
+        await session.commit()
+        rows = await session.execute(
+            select(ProjectTaskStatsTableModel).where(ProjectTaskStatsTableModel.project_id == project.id)
+        )
+        assert rows.scalars().all() == []
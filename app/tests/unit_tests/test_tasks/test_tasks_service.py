@@ -1,6 +1,13 @@
+import asyncio
+import json
+from datetime import datetime, UTC
+
 import pytest
+from fastapi import HTTPException
 
+from app.projects.service import ProjectService
 from app.tasks.service import TaskService
+from app.tasks.schemas import SchemaTaskAdd, SchemaTaskUpdate, SchemaTaskFilter, SchemaAssignedTaskFilter
 
 
 @pytest.mark.parametrize("name, description, project_id, assignee_id, priority, creator_id, status, local_task_id",[
@@ -83,3 +90,169 @@ async def test_delete_task_not_exist():
     task = await TaskService.delete_by_id(999999)
 
     assert task == False
+
+
+async def test_add_task_concurrently_unique_local_ids(project_member):
+    """Параллельное создание задач в одном проекте не выдаёт повторяющихся номеров"""
+    parallel = 50
+    manager = await project_member(project_id=2, user_id=2)
+    new_task = SchemaTaskAdd(name="Concurrent task", project_id=2, assignee_id=2, priority=1)
+
+    tasks = await asyncio.gather(*(TaskService.add_task(new_task, manager) for _ in range(parallel)))
+
+    local_ids = sorted(task.local_task_id for task in tasks)
+    assert len(set(local_ids)) == parallel
+    assert local_ids == list(range(local_ids[0], local_ids[0] + parallel))
+
+    for task in tasks:
+        await TaskService.delete_by_id(task.id)
+
+
+async def test_add_task_keeps_project_cache(project_member):
+    manager = await project_member(project_id=2, user_id=2)
+    invalidations = ProjectService.cache.stats()["invalidations"]
+
+    task = await TaskService.add_task(SchemaTaskAdd(name="Cached project", project_id=2, assignee_id=2, priority=1), manager)
+
+    assert ProjectService.cache.stats()["invalidations"] == invalidations
+    await TaskService.delete_by_id(task.id)
+
+
+async def test_add_task_integrity_error_is_bad_request(project_member, monkeypatch):
+    manager = await project_member(project_id=2, user_id=2)
+    task = await TaskService.add_task(SchemaTaskAdd(name="Taken number", project_id=2, assignee_id=2, priority=1), manager)
+
+    async def reserve_taken(project_id, session, count=1):
+        return task.local_task_id
+
+    monkeypatch.setattr(ProjectService, "reserve_local_task_ids", reserve_taken)
+    with pytest.raises(HTTPException) as e:
+        await TaskService.add_task(SchemaTaskAdd(name="Duplicate number", project_id=2, assignee_id=2, priority=1), manager)
+    assert e.value.status_code == 400
+
+    await TaskService.delete_by_id(task.id)
+
+
+async def test_update_task_moves_to_free_local_id(project_member):
+    manager = await project_member(project_id=1, user_id=2)
+    await project_member(project_id=2, user_id=2)
+    task = await TaskService.add_task(SchemaTaskAdd(name="Moved task", project_id=1, assignee_id=2, priority=1), manager)
+    taken = {other.local_task_id for other in await TaskService.find_all(project_id=2)}
+
+    moved = await TaskService.update_task(
+        task.id, SchemaTaskUpdate(name="Moved task", project_id=2, assignee_id=2, priority=1), manager
+    )
+
+    assert moved.project_id == 2
+    assert moved.local_task_id not in taken
+    await TaskService.delete_by_id(task.id)
+
+
+async def test_get_tasks_page_keyset(project_member):
+    manager = await project_member(project_id=2, user_id=2)
+    new_task = SchemaTaskAdd(name="Paged task", project_id=2, assignee_id=3, priority=2)
+    created = [await TaskService.add_task(new_task, manager) for _ in range(5)]
+
+    seen = []
+    cursor = None
+    while True:
+        filters = SchemaTaskFilter(assignee_id=3, sort="local_task_id", order="desc", limit=2, cursor=cursor)
+        page = await TaskService.get_tasks_page(2, filters, manager)
+        assert len(page.items) <= 2
+        seen.extend(task.local_task_id for task in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == sorted((task.local_task_id for task in created), reverse=True)
+
+    for task in created:
+        await TaskService.delete_by_id(task.id)
+
+
+async def test_add_tasks_bulk(project_member):
+    manager = await project_member(project_id=2, user_id=2)
+    new_tasks = [SchemaTaskAdd(name=f"Bulk task {i}", project_id=2, assignee_id=2, priority=1) for i in range(3)]
+
+    tasks = await TaskService.add_tasks_bulk(new_tasks, manager)
+
+    assert [task.name for task in tasks] == [task.name for task in new_tasks]
+    first = tasks[0].local_task_id
+    assert [task.local_task_id for task in tasks] == [first, first + 1, first + 2]
+
+    for task in tasks:
+        await TaskService.delete_by_id(task.id)
+
+
+async def test_add_tasks_bulk_different_projects(project_member):
+    manager = await project_member(project_id=2, user_id=2)
+    new_tasks = [
+        SchemaTaskAdd(name="Bulk task", project_id=1, assignee_id=2, priority=1),
+        SchemaTaskAdd(name="Bulk task", project_id=2, assignee_id=2, priority=1),
+    ]
+
+    with pytest.raises(HTTPException) as exc:
+        await TaskService.add_tasks_bulk(new_tasks, manager)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_export_tasks(export_format, project_member):
+    manager = await project_member(project_id=2, user_id=2)
+    expected = await TaskService.find_all(project_id=2)
+
+    rows = await TaskService.export_tasks(2, export_format, manager)
+    lines = "".join([chunk async for chunk in rows]).splitlines()
+
+    if export_format == "csv":
+        assert lines[0].startswith("id,local_task_id,project_id")
+        lines = lines[1:]
+    else:
+        assert {json.loads(line)["id"] for line in lines} == {task.id for task in expected}
+    assert len(lines) == len(expected)
+
+
+async def test_get_assigned_tasks_due_date_order(project_member):
+    user = await project_member(project_id=2, user_id=3)
+    due_dates = [None, datetime(2030, 1, 2, tzinfo=UTC), datetime(2030, 1, 1, tzinfo=UTC)]
+    created = [
+        await TaskService.add(name="Assigned task", project_id=2, creator_id=2, assignee_id=3, priority=1,
+                              status=7, due_date=due_date, local_task_id=950 + i)
+        for i, due_date in enumerate(due_dates)
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        page = await TaskService.get_assigned_tasks(SchemaAssignedTaskFilter(status=7, limit=1, cursor=cursor), user)
+        seen.extend(task.id for task in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [created[2].id, created[1].id, created[0].id]
+
+    for task in created:
+        await TaskService.delete_by_id(task.id)
+
+
+async def test_board_columns_and_cursors(project_member):
+    user = await project_member(1, 2)
+    created = await TaskService.add_tasks_bulk(
+        [SchemaTaskAdd(name=f"board{i}", project_id=1, assignee_id=2, priority=1) for i in range(3)], user
+    )
+
+    board = await TaskService.get_board(1, limit=2, current_user=user)
+    column = next(column for column in board.columns if column.status == 1)
+    assert len(column.items) == 2
+    assert column.total >= 3
+    assert column.next_cursor is not None
+
+    page = await TaskService.get_tasks_page(
+        1, SchemaTaskFilter(status=1, limit=500, cursor=column.next_cursor), user
+    )
+    assert len(column.items) + len(page.items) == column.total
+    assert page.items[0].local_task_id > column.items[-1].local_task_id
+
+    for task in created:
+        await TaskService.delete_by_id(task.id)
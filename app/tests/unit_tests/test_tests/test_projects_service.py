@@ -1,6 +1,8 @@
 import pytest
 
-from app.projects.service import ProjectService
+from app.projects.service import ProjectService, membership_memo_scope
+from app.service.query_stats import query_stats_scope
+from app.tasks.exeptions import ProjectNotFound
 
 
 @pytest.mark.parametrize("name, prefix_name, description, creator_id",[
@@ -15,6 +17,20 @@ async def test_add_project(name, prefix_name, description, creator_id):
     assert project.description == description
     assert project.creator_id == creator_id
 
+
+async def test_get_project_id_by_prefix():
+    project = await ProjectService.add(name="Prefixed", prefix_name="PFX", description="Prefixed", creator_id=2)
+
+    assert await ProjectService.get_project_id_by_prefix("PFX") == project.id
+    assert await ProjectService.get_project_id_by_prefix("pfx") == project.id
+
+    await ProjectService.delete_by_id(project.id)
+
+
+async def test_get_project_id_by_prefix_not_found():
+    with pytest.raises(ProjectNotFound):
+        await ProjectService.get_project_id_by_prefix("NOPE")
+
 @pytest.mark.parametrize("project_id, updated_name, updated_description",[
     (1, "Updated project 1", "Updated project 1 description"),
 ])
@@ -84,4 +100,13 @@ async def test_delete_project_twice():
     assert result_first is True
 
     result_second = await ProjectService.delete_by_id(project.id)
-    assert result_second is False
\ No newline at end of file
+    assert result_second is False
+
+async def test_user_in_project_memo():
+    with membership_memo_scope(), query_stats_scope() as stats:
+        assert await ProjectService.user_in_project(2, 9999) is False
+        assert stats.count == 1
+        assert await ProjectService.user_in_project(2, 9999) is False
+        assert stats.count == 1
+        assert await ProjectService.user_in_project(9999, 2) is False
+        assert stats.count == 2
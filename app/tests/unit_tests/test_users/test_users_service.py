@@ -1,5 +1,16 @@
 import pytest
+from sqlalchemy import event
 
+from app.database import engine, session_scope
+
+from app.service.cache import MISSING
+from app.users.cache import principal_cache
+from app.users.dependencies import get_current_user
+from app.users import hashing
+from app.users.auth import authenticate_user
+from app.users.hashing import get_password_hash_async, verify_password_async, hashing_executor
+from app.users.jwt_utils import create_access_token
+from app.users.schemas import SchemaPrincipal
 from app.users.service import UsersService
 
 @pytest.mark.parametrize("user_id, email, surname, patronymic, username, is_admin, is_manager, is_user",[
@@ -21,4 +32,80 @@ async def test_find_user_by_id(user_id, email, surname, patronymic, username, is
 
 async def test_find_user_by_id_not_found():
     user = await UsersService.find_by_id(99999)  # id, который точно не существует
-    assert user is None
\ No newline at end of file
+    assert user is None
+
+
+async def test_principal_cache_invalidated_on_update():
+    token = create_access_token({"sub": "2"})
+    principal = await get_current_user(token)
+    assert principal == SchemaPrincipal(id=2, is_active=True, is_admin=False, is_manager=True, is_user=False)
+    hits_before = principal_cache.hits
+    assert await get_current_user(token) is principal
+    assert principal_cache.hits == hits_before + 1
+    assert not hasattr(principal, "hash_password")
+
+    await UsersService.update_by_id(2, surname="String")
+    assert principal_cache.get(2) is MISSING
+
+
+async def test_password_hashing_in_executor():
+    hashed = await get_password_hash_async("secret")
+
+    assert await verify_password_async("secret", hashed)
+    assert not await verify_password_async("wrong", hashed)
+    assert hashing_executor.stats()["queued"] == 0
+    assert hashing_executor.stats()["running"] == 0
+
+
+async def test_connection_released_while_hashing(monkeypatch):
+    checked_out = 0
+    during_hashing = []
+
+    def on_checkout(*args):
+        nonlocal checked_out
+        checked_out += 1
+
+    def on_checkin(*args):
+        nonlocal checked_out
+        checked_out -= 1
+
+    verify_password = hashing.verify_password
+
+    def verify_and_record(plain_password, hashed_password):
+        during_hashing.append(checked_out)
+        return verify_password(plain_password, hashed_password)
+
+    monkeypatch.setattr(hashing, "verify_password", verify_and_record)
+    event.listen(engine.sync_engine, "checkout", on_checkout)
+    event.listen(engine.sync_engine, "checkin", on_checkin)
+    try:
+        async with session_scope():
+            user = await authenticate_user("admin", "admin")
+    finally:
+        event.remove(engine.sync_engine, "checkout", on_checkout)
+        event.remove(engine.sync_engine, "checkin", on_checkin)
+
+    assert user.username == "admin"
+    assert during_hashing == [0]
+
+
+async def test_model_cache_read_through_and_invalidation():
+    before = UsersService.cache.stats()
+    first = await UsersService.find_by_id(3)
+    second = await UsersService.find_by_id(3)
+    assert second.username == first.username
+    assert UsersService.cache.stats()["hits"] > before["hits"]
+
+    await UsersService.update_by_id(3, name="Cached")
+    assert (await UsersService.find_by_id(3)).name == "Cached"
+    assert (await UsersService.find_one_or_none(username=first.username)).name == "Cached"
+
+
+async def test_model_cache_negative_entry_cleared_on_add():
+    assert await UsersService.find_one_or_none(username="cached_user") is None
+    assert await UsersService.find_one_or_none(username="cached_user") is None
+    user = await UsersService.add(
+        email="cached@example.com", name="c", surname="c", patronymic="c",
+        username="cached_user", hash_password="x",
+    )
+    assert (await UsersService.find_one_or_none(username="cached_user")).id == user.id
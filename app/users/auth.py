@@ -1,9 +1,9 @@
-from app.users.hashing import verify_password
+from app.users.hashing import verify_password_async
 
 
 async def authenticate_user(username: str, password: str):
     from app.users.service import UsersService
-    user = await UsersService.find_one_or_none(username=username)
-    if not user or not verify_password(password, user.hash_password):
+    user = await UsersService.find_with_password(username=username)
+    if not user or not await verify_password_async(password, user.hash_password):
         return None
     return user
@@ -0,0 +1,8 @@
+from app.config import settings
+from app.service.cache import TTLCache
+from app.service.invalidation import register_cache
+
+# Кэш принципалов (id, роли, активность) пользователей, прошедших аутентификацию, по id:
+# избавляет get_current_user от запроса в БД на каждый запрос. Сбрасывается UsersService при изменении пользователя во всех воркерах.
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL)
+register_cache("principal", principal_cache.pop, principal_cache.clear)
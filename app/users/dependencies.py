@@ -6,7 +6,9 @@ from jose import jwt, JWTError
 from app.config import settings
 from app.exceptions import UserPermissionError, UserIsNotPresentException, TokenExpiredException, \
     IncorrectTokenFormatException, TokenAbsentException, UserIsNotActive
-from app.users.schemas import SchemaUser
+from app.service.cache import MISSING
+from app.users.cache import principal_cache
+from app.users.schemas import SchemaPrincipal
 from app.users.service import UsersService
 
 
@@ -17,7 +19,7 @@ def get_token(request: Request):
     return token
 
 
-async def get_current_user(token: str = Depends(get_token)):
+async def get_current_user(token: str = Depends(get_token)) -> SchemaPrincipal:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, settings.ALGORITHM
@@ -40,15 +42,19 @@ async def get_current_user(token: str = Depends(get_token)):
     user_id: str = payload.get("sub")
     if not user_id:
         raise UserIsNotPresentException
-    user = await UsersService.find_by_id(int(user_id))
-    if not user:
-        raise UserIsNotPresentException
-    if not user.is_active:
+    principal = principal_cache.get(int(user_id))
+    if principal is MISSING:
+        user = await UsersService.find_by_id(int(user_id))
+        if not user:
+            raise UserIsNotPresentException
+        principal = SchemaPrincipal.model_validate(user)
+        principal_cache.set(principal.id, principal)
+    if not principal.is_active:
         raise UserIsNotActive
-    return user
+    return principal
 
 
-async def get_current_admin_user(current_user: SchemaUser = Depends(get_current_user)):
+async def get_current_admin_user(current_user: SchemaPrincipal = Depends(get_current_user)):
     if current_user.is_admin:
         return current_user
     raise UserPermissionError
@@ -1,5 +1,12 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
 from passlib.context import CryptContext
 
+from app.config import settings
+from app.database import release_connection
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -9,3 +16,65 @@ def get_password_hash(password: str) -> str:
 
 def verify_password(plain_password, hashed_password) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingExecutor:
+    """
+    Пул потоков или процессов для bcrypt, чтобы хеширование не блокировало event loop.
+    Число одновременных операций ограничено max_workers, остальные ждут своей очереди.
+    """
+
+    def __init__(self, kind: str, max_workers: int):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.queued = 0
+        self.running = 0
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            executor_class = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, func: Callable, *args):
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "running": self.running,
+        }
+
+
+hashing_executor = HashingExecutor(settings.HASHING_EXECUTOR, settings.HASHING_MAX_WORKERS)
+
+
+async def get_password_hash_async(password: str) -> str:
+    # Очередь к пулу хеширования может быть долгой: соединение с БД на это время не удерживается
+    await release_connection()
+    return await hashing_executor.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    await release_connection()
+    return await hashing_executor.run(verify_password, plain_password, hashed_password)
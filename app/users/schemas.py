@@ -49,6 +49,17 @@ class SchemaUser(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SchemaPrincipal(BaseModel):
+    """Аутентифицированный пользователь для проверок доступа: без персональных данных и хеша пароля"""
+    id: int = Field(..., description="Идентификатор пользователя")
+    is_active: bool = Field(..., description="Активен ли пользователь")
+    is_admin: bool = Field(..., description="Права админа")
+    is_manager: bool = Field(..., description="Права менеджера")
+    is_user: bool = Field(..., description="Пользователь")
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 class SchemaUserAuth(BaseModel):
     username: str = Field(..., description="Аккаунт пользователя")
     password: str = Field(..., description="Пароль пользователя")
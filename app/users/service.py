@@ -1,17 +1,47 @@
+from typing import Optional
+
 from fastapi import Response
+from sqlalchemy import select
 
 from app.exceptions import UserAlreadyExistsException, IncorrectUsernameOrPasswordException, UserPermissionError
+from app.database import after_commit, execute_read
 from app.service.base import BaseService
+from app.service.cache import make_model_cache
+from app.service.invalidation import publish_invalidation
 from app.users.auth import authenticate_user
+from app.users.cache import principal_cache
 from app.users.exeptions import UserNotFound
-from app.users.hashing import verify_password, get_password_hash
+from app.users.hashing import verify_password_async, get_password_hash_async
 from app.users.jwt_utils import create_access_token
 from app.users.models import UsersTableModel
-from app.users.schemas import SchemaUserRegister, SchemaUserAuth, SchemaUserUpdate, SchemaUser, SchemaUserPasswordUpdate
+from app.users.schemas import (
+    SchemaUserRegister, SchemaUserAuth, SchemaUserUpdate, SchemaUserPasswordUpdate, SchemaPrincipal
+)
 
 
 class UsersService(BaseService):
     model = UsersTableModel
+    # Хеш пароля в кэш не попадает и читается только из БД через find_with_password
+    cache = make_model_cache(UsersTableModel, exclude=("hash_password",))
+
+    @classmethod
+    async def find_with_password(cls, **filter_by) -> Optional[UsersTableModel]:
+        result = await execute_read(select(UsersTableModel).filter_by(**filter_by), allow_replica=False)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def update_by_id(cls, object_id: int, **data):
+        user = await super().update_by_id(object_id, **data)
+        after_commit(lambda: principal_cache.pop(object_id))
+        await publish_invalidation("principal", object_id)
+        return user
+
+    @classmethod
+    async def delete_by_id(cls, object_id: int) -> bool:
+        result = await super().delete_by_id(object_id)
+        after_commit(lambda: principal_cache.pop(object_id))
+        await publish_invalidation("principal", object_id)
+        return result
 
     @classmethod
     async def check_unique_fields_on_update(cls, user_id: int, email: str = None, username: str = None):
@@ -27,16 +57,14 @@ class UsersService(BaseService):
 
     @classmethod
     async def update_password(cls, user_id: int, old_password: str, new_password: str):
-        user = await cls.find_by_id(user_id)
-        if not user or not verify_password(old_password, user.hash_password):
+        user = await cls.find_with_password(id=user_id)
+        if not user or not await verify_password_async(old_password, user.hash_password):
             raise IncorrectUsernameOrPasswordException(detail="Current password is incorrect")
-        new_hash = get_password_hash(new_password)
-        await UsersService.update_by_id(user_id, hash_password=new_hash)
-        updated_user = await cls.find_by_id(user_id)
-        return updated_user
+        new_hash = await get_password_hash_async(new_password)
+        return await UsersService.update_by_id(user_id, hash_password=new_hash)
 
     @classmethod
-    async def register_user(cls, user_data: SchemaUserRegister, current_user: UsersTableModel):
+    async def register_user(cls, user_data: SchemaUserRegister, current_user: SchemaPrincipal):
         if not current_user.is_admin:
             raise UserPermissionError
 
@@ -45,7 +73,7 @@ class UsersService(BaseService):
         if existing_user or existing_username:
             raise UserAlreadyExistsException
 
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         user_dict = user_data.model_dump(exclude={"password"})
         user = await UsersService.add(hash_password=hashed_password, **user_dict)
         return user
@@ -65,7 +93,7 @@ class UsersService(BaseService):
         return {"detail": "Logged out successfully."}
 
     @classmethod
-    async def update_user(cls, user_id: int, update_user_data: SchemaUserUpdate, current_user: UsersTableModel):
+    async def update_user(cls, user_id: int, update_user_data: SchemaUserUpdate, current_user: SchemaPrincipal):
         if not current_user.is_admin:
             raise UserPermissionError
         user_obj = await UsersService.find_by_id(user_id)
@@ -80,13 +108,21 @@ class UsersService(BaseService):
         return user
 
     @classmethod
-    async def get_user_all(cls, current_user: SchemaUser):
+    async def get_user_me(cls, current_user: SchemaPrincipal):
+        """Полные данные пользователя; в кэше принципалов хранятся только id, роли и активность."""
+        user = await UsersService.find_by_id(current_user.id)
+        if not user:
+            raise UserNotFound
+        return user
+
+    @classmethod
+    async def get_user_all(cls, current_user: SchemaPrincipal):
         if not current_user.is_admin:
             raise UserPermissionError
         return await UsersService.find_all()
 
     @classmethod
-    async def change_password(cls, data: SchemaUserPasswordUpdate, current_user: UsersTableModel):
+    async def change_password(cls, data: SchemaUserPasswordUpdate, current_user: SchemaPrincipal):
         user = await UsersService.update_password(
             user_id=current_user.id,
             old_password=data.old_password,
@@ -95,12 +131,12 @@ class UsersService(BaseService):
         return user
 
     @classmethod
-    async def admin_change_password(cls, user_id: int, new_password: str, current_user: UsersTableModel):
+    async def admin_change_password(cls, user_id: int, new_password: str, current_user: SchemaPrincipal):
         if not current_user.is_admin:
             raise UserPermissionError
         user = await UsersService.find_by_id(user_id)
         if not user:
             raise UserNotFound
-        new_hash = get_password_hash(new_password)
+        new_hash = await get_password_hash_async(new_password)
         updated_user = await UsersService.update_by_id(user_id, hash_password=new_hash)
         return updated_user